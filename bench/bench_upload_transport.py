@@ -0,0 +1,92 @@
+"""对比 upload_transport 为 requests 和 sendfile 时的上传吞吐量和客户端 CPU 占用
+
+在子进程中启动一个只读取请求体的本地 html5up.php 接收端(http)，用同一个文件分别以两种方式上传。
+CPU 为客户端进程的 user+sys 时间(getrusage)，接收端在另一个进程中，不计入。
+
+用法: python bench/bench_upload_transport.py [--size 1G] [--rounds 3] [--file 路径]
+"""
+import os
+import sys
+import time
+import contextlib
+import argparse
+import resource
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import lanzou_web  # noqa: E402
+
+UPLOAD_REPLY = b'{"zt": 1, "info": "ok", "text": [{"id": "1", "f_id": "s1"}]}'
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    """读完请求体后返回上传成功，不保存内容"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        remaining = int(self.headers['Content-Length'])
+        while remaining:
+            remaining -= len(self.rfile.read1(min(remaining, 1 << 20)))
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(UPLOAD_REPLY)))
+        self.end_headers()
+        self.wfile.write(UPLOAD_REPLY)
+
+
+def run_sink():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SinkHandler)
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+def cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default='1G', help="测试文件大小，如 256M、1G")
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--file', default=None, help="测试文件路径，默认在当前目录生成 bench_upload.bin")
+    parser.add_argument('--sink', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.sink:
+        run_sink()
+        return
+
+    size = lanzou_web.parse_size_arg(args.size)
+    path = args.file or 'bench_upload.bin'
+    if not os.path.exists(path) or os.path.getsize(path) != size:
+        with open(path, 'wb') as f:
+            for _ in range(0, size, 1 << 24):
+                f.write(os.urandom(min(1 << 24, size - f.tell())))
+
+    sink = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--sink'], stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(sink.stdout.readline())
+        lanzou_web.LANZOU_CONFIG['uid'] = 'bench'
+        client = lanzou_web.LanZouWeb()
+        client.base_url = f'http://127.0.0.1:{port}'
+        client.is_login = True
+        client.rate_limiter = None  # 忽略 config.py 中的 upload_limit
+        print(f"文件大小 {size / 2 ** 20:.0f} MiB，Python {sys.version.split()[0]}，requests {lanzou_web.requests.__version__}")
+        for _ in range(args.rounds):
+            for transport in lanzou_web.UPLOAD_TRANSPORTS:
+                client.upload_transport = transport
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), \
+                        contextlib.redirect_stderr(devnull):
+                    wall, cpu = time.perf_counter(), cpu_time()
+                    client.transfer_file(path)
+                    wall, cpu = time.perf_counter() - wall, cpu_time() - cpu
+                print(f"{transport:9s} {size / wall / 2 ** 20:8.0f} MiB/s  wall {wall:.2f}s  client cpu {cpu:.2f}s")
+    finally:
+        sink.kill()
+
+
+if __name__ == '__main__':
+    main()
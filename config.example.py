@@ -3,5 +3,8 @@ LANZOU_CONFIG = {
     "username": "your_phone_number",  # 替换为你的蓝奏云账号
     "password": "your_password",      # 替换为你的蓝奏云密码
     "uid": "xxxxxxx",                 # 替换为你的蓝奏云用户ID，可以从浏览器F12开发者工具中获取
-    "default_folder_id": "-1"         # 默认上传到根目录，如果要上传到其他文件夹，替换为对应的folder_id
+    "default_folder_id": "-1",        # 默认上传到根目录，如果要上传到其他文件夹，替换为对应的folder_id
+    "max_workers": 4,                 # 可选，遍历目录、获取分享链接等操作的最大并发请求数
+    "upload_limit": None,             # 可选，上传限速，如 "20M" 表示每秒 20MB，None 或 0 为不限速
+    "upload_transport": "requests"    # 可选，上传本地文件的方式，"sendfile" 由内核直接发送文件内容，CPU 占用更低(仅 http 上传地址)
 } 
\ No newline at end of file
@@ -1,13 +1,50 @@
 import os
 import re
+import csv
+import copy
 import sys
 import time
 import json
+import queue
+import random
+import tarfile
+import zipfile
+import fnmatch
+import itertools
+import select
+import struct
+import tempfile
+import ctypes
+import ctypes.util
+import threading
+import http.client
 import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+
+try:
+    import readline  # 交互模式的命令补全，Windows 上可能没有
+except ImportError:
+    readline = None
+
+try:
+    import fcntl  # 多个进程共用 cookie.json 时的文件锁
+except ImportError:
+    fcntl = None
+    try:
+        import msvcrt  # Windows
+    except ImportError:
+        msvcrt = None
 
 from tqdm import tqdm
-from typing import List, Dict, Optional
-from config import LANZOU_CONFIG
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+try:
+    from config import LANZOU_CONFIG
+except ImportError:
+    LANZOU_CONFIG = {}  # 作为库使用时可以不提供 config.py，直接向 LanZouWeb 传入配置
 
 # 终端颜色
 GREEN = "\033[92m"      # 成功
@@ -18,6 +55,54 @@ CYAN = "\033[96m"       # 提示
 RESET = "\033[0m"       # 重置颜色
 BOLD = "\033[1m"        # 粗体
 
+class LanZouError(Exception):
+    """蓝奏云操作错误的基类"""
+
+class ConfigError(LanZouError):
+    """配置缺失或无效"""
+
+class LoginError(LanZouError):
+    """未登录，或登录失败"""
+
+class RequestError(LanZouError):
+    """网络请求失败，或服务器返回了错误"""
+
+class PathError(LanZouError):
+    """网盘中的目录不存在"""
+
+class UploadError(LanZouError):
+    """上传失败，phase 表示出错的阶段"""
+    phase = "upload"
+    phase_name = "上传"
+    retryable = True
+
+    def __init__(self, message: str, file_id: str = None):
+        super().__init__(message)
+        self.file_id = file_id  # 文件已上传成功时为文件ID
+        self.parts = []  # upload_stream 中失败前已上传的分卷
+
+class LocalFileError(UploadError):
+    """本地文件不存在或无法读取"""
+    phase = "local"
+    phase_name = "读取本地文件"
+    retryable = False
+
+class TransportError(UploadError):
+    """传输阶段的网络错误，可以重新传输"""
+    phase = "transport"
+    phase_name = "传输"
+
+class ServerRejectedError(UploadError):
+    """服务器拒绝了上传(文件类型不支持、参数错误等)，重试也不会成功"""
+    phase = "rejected"
+    phase_name = "服务器拒绝"
+    retryable = False
+
+class MetadataError(UploadError):
+    """文件已经上传，但上传后的处理(获取分享链接)失败，重试时只需重做这一步"""
+    phase = "metadata"
+    phase_name = "获取分享链接"
+
 class FileInfo:
     def __init__(self, data: Dict):
         self.name = data.get('name', '')  # 文件名
@@ -44,8 +129,807 @@ class FolderInfo:
     def __str__(self):
         return f"[目录] {self.name} (ID: {self.folder_id})"
 
-class LanZouWeb:
+SIZE_UNITS = {'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def parse_size_text(text: str) -> int:
+    """将蓝奏云返回的大小文本(如 "1.2 M"、"512.0 K")转换为字节数，无法解析返回-1"""
+    match = re.match(r'^\s*([\d.]+)\s*([BKMGT])?', str(text).upper())
+    if not match:
+        return -1
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2) or 'B'])
+
+def parse_size_spec(spec: str) -> Tuple[str, float, int]:
+    """解析 find -size 参数，格式为 [+|-]N[K|M|G]
+    Returns:
+        Tuple[str, float, int]: (比较符, 数值, 单位字节数)
+    """
+    match = re.match(r'^([+-]?)(\d+(?:\.\d+)?)([BKMGT]?)B?$', spec.strip().upper())
+    if not match:
+        raise ValueError(f"无效的大小参数: {spec}")
+    return match.group(1), float(match.group(2)), SIZE_UNITS[match.group(3) or 'B']
+
+def parse_size_arg(text: str) -> int:
+    """解析命令行中的大小参数，如 50M、512K"""
+    op, value, unit = parse_size_spec(text)
+    if op:
+        raise ValueError(f"无效的大小参数: {text}")
+    return int(value * unit)
+
+def parse_lanzou_time(text: str, now: datetime = None) -> Optional[datetime]:
+    """解析蓝奏云的时间文本，支持 "2024-01-02"、"3 天前"、"昨天" 等格式"""
+    now = now or datetime.now()
+    text = str(text).strip()
+    relative = {'秒': 'seconds', '分钟': 'minutes', '小时': 'hours', '天': 'days'}
+    match = re.match(r'^(\d+)\s*(秒|分钟|小时|天)前$', text)
+    if match:
+        return now - timedelta(**{relative[match.group(2)]: int(match.group(1))})
+    if text == '刚刚':
+        return now
+    if text in ('昨天', '前天'):
+        days = 1 if text == '昨天' else 2
+        return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    return None
+
+def parse_newer_spec(spec: str) -> datetime:
+    """解析 find -newer 参数，支持日期(2024-01-02)或相对时间(7d、12h、30m)"""
+    match = re.match(r'^(\d+)([dhm])$', spec.strip().lower())
+    if match:
+        unit = {'d': 'days', 'h': 'hours', 'm': 'minutes'}[match.group(2)]
+        return datetime.now() - timedelta(**{unit: int(match.group(1))})
+    result = parse_lanzou_time(spec)
+    if result is None:
+        raise ValueError(f"无效的时间参数: {spec}")
+    return result
+
+def _trigrams(text: str) -> set:
+    """拆分文本为三元组集合"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class FileIndex:
+    """内存文件索引
+    以文件名三元组(trigram)建立倒排表，重复查找时只需在候选集合上做精确匹配，无需重新遍历网盘
+    """
+    def __init__(self, entries: List[Tuple[str, FileInfo]]):
+        self.entries = entries  # [(所在目录路径, 文件信息)]
+        self.created = time.time()
+        self._postings = {}
+        for i, (_, file) in enumerate(entries):
+            for gram in _trigrams((file.name_all or file.name).lower()):
+                self._postings.setdefault(gram, set()).add(i)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _candidates(self, pattern: str):
+        """根据glob模式中的字面量片段筛选候选条目，没有可用片段时返回全部条目"""
+        literals = [part for part in re.split(r'\[[^\]]*\]|[*?]', pattern.lower()) if len(part) >= 3]
+        if not literals:
+            return range(len(self.entries))
+        result = None
+        for literal in literals:
+            for gram in _trigrams(literal):
+                ids = self._postings.get(gram, set())
+                result = ids if result is None else result & ids
+                if not result:
+                    return []
+        return sorted(result)
+
+    def search(self, name: str = None, iname: str = None, regex: str = None,
+               size: Tuple[str, float, int] = None, newer: datetime = None) -> List[Tuple[str, FileInfo]]:
+        """按条件查找文件，所有条件需同时满足
+        Args:
+            name: 文件名glob模式(区分大小写)
+            iname: 文件名glob模式(不区分大小写)
+            regex: 文件名正则表达式
+            size: parse_size_spec 的解析结果
+            newer: 只匹配晚于该时间上传的文件
+        Returns:
+            List[Tuple[str, FileInfo]]: [(所在目录路径, 文件信息)]
+        """
+        candidates = self._candidates(name or iname or '')
+        pattern = re.compile(regex) if regex else None
+        now = datetime.now()
+        results = []
+        for i in candidates:
+            path, file = self.entries[i]
+            file_name = file.name_all or file.name
+            if name and not fnmatch.fnmatchcase(file_name, name):
+                continue
+            if iname and not fnmatch.fnmatchcase(file_name.lower(), iname.lower()):
+                continue
+            if pattern and not pattern.search(file_name):
+                continue
+            if size:
+                op, value, unit = size
+                file_size = parse_size_text(file.size)
+                if file_size < 0:
+                    continue
+                if op == '+' and not file_size > value * unit:
+                    continue
+                if op == '-' and not file_size < value * unit:
+                    continue
+                if not op and -(-file_size // unit) != value:
+                    continue
+            if newer:
+                file_time = parse_lanzou_time(file.time, now)
+                if file_time is None or file_time <= newer:
+                    continue
+            results.append((path, file))
+        return results
+
+MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 免费用户单文件大小限制
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 流式上传的分块大小
+UPLOAD_RETRIES = 3  # 上传各阶段的最多尝试次数
+UPLOAD_TRANSPORTS = ('requests', 'sendfile')  # 可选的上传传输方式
+SENDFILE_SLICE = 4 * 1024 * 1024  # sendfile 每次调用发送的字节数，决定进度与限速的粒度
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """第 attempt 次失败后的等待时间，指数增长并加入随机抖动，避免多个任务同时重试"""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def iter_file_chunks(f, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """按块读取文件对象"""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+def read_up_to(stream, size: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> bytearray:
+    """从数据流中读取最多 size 字节，只有到达流末尾时才会少于 size"""
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = stream.read(min(chunk_size, size - len(buffer)))
+        if not chunk:
+            break
+        buffer += chunk
+    return buffer
+
+def read_into(stream, buffer: bytearray, start: int = 0, chunk_size: int = UPLOAD_CHUNK_SIZE) -> int:
+    """从数据流中读取数据原地填入 buffer[start:]，不分配新的缓冲区
+    Returns:
+        int: buffer 中有效数据的长度，只有到达流末尾时才会小于 len(buffer)
+    """
+    view = memoryview(buffer)
+    readinto = getattr(stream, 'readinto', None)
+    position = start
+    while position < len(buffer):
+        end = min(position + chunk_size, len(buffer))
+        if readinto:
+            count = readinto(view[position:end])
+        else:
+            chunk = stream.read(end - position)
+            count = len(chunk)
+            view[position:position + count] = chunk
+        if not count:
+            break
+        position += count
+    return position
+
+def iter_buffer_chunks(buffer, length: int = None, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """按块迭代内存缓冲区的前 length 字节(默认全部)"""
+    view = memoryview(buffer)[:length]
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+
+def part_name(file_name: str, index: int) -> str:
+    """分卷文件名，保留原扩展名以免被网盘按类型拒绝，如 backup.part001.zip"""
+    stem, ext = os.path.splitext(file_name)
+    return f"{stem}.part{index:03d}{ext}"
+
+def write_json_atomic(path: str, data, **kwargs):
+    """先写同目录下的临时文件再改名替换，读取方永远不会看到写了一半的文件"""
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.',
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class InterProcessLock:
+    """基于锁文件的进程间互斥锁(fcntl.flock，Windows 上为 msvcrt.locking)，两者都没有时不加锁
+    用法: with InterProcessLock('cookie.json.lock'): ...
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._f = None
+
+    def __enter__(self):
+        self._f = open(self.path, 'a+b')
+        try:
+            if fcntl:
+                fcntl.flock(self._f.fileno(), fcntl.LOCK_EX)
+            elif msvcrt:
+                self._f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass  # LK_LOCK 尝试约10秒后仍拿不到锁会报错，继续等待
+        except BaseException:
+            self._f.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl:
+                fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt:
+                self._f.seek(0)
+                msvcrt.locking(self._f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._f.close()
+            self._f = None
+
+class LockedCookieJar(RequestsCookieJar):
+    """使用外部传入的锁的 cookie jar
+    http.cookiejar 在 set_cookie、extract_cookies 等方法中持有 _cookies_lock，requests 把响应中的 cookie
+    合并进 session 时也经过 extract_cookies。把这把锁换成客户端的 _cookie_lock 后，保存、加载 cookie 不会与
+    其他线程正在合并的响应交错；遍历时也先在锁内取快照，避免遍历到一半 cookie 被修改。
+    """
+    def __init__(self, lock, policy=None):
+        super().__init__(policy)
+        self._cookies_lock = lock
+
+    def __iter__(self):
+        with self._cookies_lock:
+            return iter(list(super().__iter__()))
+
+def session_expired(result: Dict) -> bool:
+    """接口响应是否表示登录已过期: zt 为 9，或者失败信息要求重新登录"""
+    return result.get('zt') != 1 and (result.get('zt') == 9 or "登录" in str(result.get('info', '')))
+
+class MultipartStream:
+    """流式 multipart/form-data 请求体
+    内存中只保存表单头部和结尾，文件内容在发送时才从 chunks 迭代器逐块读取，可直接作为 requests 的 data 参数。
+    已知文件大小时提供 len 属性，requests 据此发送 Content-Length；否则使用分块传输编码。
+    """
+    def __init__(self, fields: Dict[str, str], file_field: str, file_name: str, chunks,
+                 size: int = None, callback=None):
+        boundary = f"----LanzouBoundary{os.urandom(8).hex()}"
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        preamble = b""
+        for key, value in fields.items():
+            preamble += (f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n'
+                         f'{value}\r\n').encode('utf-8')
+        preamble += (f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                     f'filename="{file_name}"\r\nContent-Type: application/octet-stream\r\n\r\n').encode('utf-8')
+        self.preamble = preamble
+        self.epilogue = f"\r\n--{boundary}--\r\n".encode('utf-8')
+        self.chunks = chunks
+        self.size = size
+        self.callback = callback  # 每发送一块文件内容后以块大小调用
+        if size is not None:
+            self.len = len(self.preamble) + size + len(self.epilogue)
+
+    def __iter__(self):
+        yield self.preamble
+        sent = 0
+        for chunk in self.chunks:
+            sent += len(chunk)
+            yield chunk
+            if self.callback:
+                self.callback(len(chunk))
+        if self.size is not None and sent != self.size:
+            raise IOError(f"文件内容长度({sent})与预期({self.size})不一致，文件可能在上传过程中被修改")
+        yield self.epilogue
+
+def sendfile_post(url: str, headers: Dict[str, str], body: MultipartStream, f, size: int,
+                  callback=None, rate_limiter=None, timeout: float = 60) -> Tuple[int, bytes]:
+    """用 http.client 发送 multipart 请求，文件内容通过 socket.sendfile 直接从文件描述符发送
+    表单头部和结尾由 body 提供，文件内容不经过 Python 缓冲区；HTTPS 连接无法使用 sendfile，
+    socket.sendfile 会退回到 8K 的缓冲发送，因此 transfer_file 只对 http 地址使用本函数。
+    Args:
+        url: 请求地址
+        headers: 请求头(含 Cookie 和 Content-Type)，Content-Length 由本函数设置
+        body: 提供 preamble/epilogue 的 MultipartStream
+        f: 以二进制模式打开的文件，从当前位置开始发送 size 字节
+        size: 文件内容长度
+        callback: 每发送一段文件内容后以发送字节数调用
+        rate_limiter: 可选的 TokenBucket
+    Returns:
+        Tuple[int, bytes]: (HTTP 状态码, 响应内容)
+    """
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    conn = connection_class(parts.hostname, parts.port, timeout=timeout)
+    try:
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        conn.putrequest('POST', path or '/', skip_accept_encoding=True)
+        for key, value in headers.items():
+            if key.lower() not in ('content-length', 'accept-encoding', 'transfer-encoding'):
+                conn.putheader(key, value)
+        conn.putheader('Content-Length', str(len(body.preamble) + size + len(body.epilogue)))
+        conn.endheaders(body.preamble)
+        
+        offset = f.tell()
+        sent = 0
+        slice_size = min(SENDFILE_SLICE, rate_limiter.burst) if rate_limiter else SENDFILE_SLICE
+        while sent < size:
+            count = min(slice_size, size - sent)
+            if rate_limiter:
+                rate_limiter.consume(count)
+            written = conn.sock.sendfile(f, offset + sent, count)
+            if written == 0:
+                raise IOError(f"文件内容长度({sent})与预期({size})不一致，文件可能在上传过程中被修改")
+            sent += written
+            if callback:
+                callback(written)
+        conn.send(body.epilogue)
+        
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+class _ChunkPipe:
+    """线程间的有界字节管道，写端供 zipfile/tarfile 使用，读端作为上传内容迭代"""
+    def __init__(self, max_chunks: int = 16):
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._position = 0
+        self._cancelled = False  # 读端提前结束(如上传失败)时通知写端停止
+
+    def write(self, data) -> int:
+        if data:
+            while True:
+                if self._cancelled:
+                    raise IOError("上传已中止")
+                try:
+                    self._queue.put(bytes(data), timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+            self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close_with(self, error: Exception = None):
+        """写入结束标记，error 不为空时读端会抛出该异常"""
+        self._queue.put(error)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self._cancelled = True
+
+PACK_FORMATS = ('zip', 'tar')
+# zip 成员超过 65535 个时 zipfile 会追加 ZIP64 结束记录，pack_layout 不计算这部分，因此按此数量拆分归档
+ZIP_MAX_MEMBERS = 0xFFFF
+
+def _member_lengths(arcname: str, size: int, fmt: str) -> Tuple[int, int]:
+    """计算单个成员在归档中占用的字节数
+    Returns:
+        Tuple[int, int]: (成员头部长度, 成员总长度)，zip的总长度包含中央目录中的记录
+    """
+    if fmt == 'zip':
+        name_length = len(_zip_member(arcname).filename.encode('utf-8'))
+        # 本地文件头 + 数据 + 数据描述符 + 中央目录记录
+        return 30 + name_length, 30 + name_length + size + 16 + 46 + name_length
+    header_length = len(_tar_member(arcname, size).tobuf(tarfile.PAX_FORMAT, 'utf-8', 'surrogateescape'))
+    return header_length, header_length + -(-size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+def pack_layout(members: List[Tuple[str, str, int]], fmt: str) -> Tuple[int, List[int]]:
+    """计算归档的总大小以及每个成员数据在归档中的偏移
+    zip 使用不压缩(STORED)+数据描述符，tar 使用 PAX 格式，两者的布局在写入前即可精确算出，
+    因此上传时可以直接给出 Content-Length，manifest 也无需等归档写完
+    Args:
+        members: [(本地路径, 归档内名称, 文件大小)]
+        fmt: zip 或 tar
+    Returns:
+        Tuple[int, List[int]]: (归档总大小, 各成员数据偏移)
+    """
+    offsets = []
+    position = 0
+    central = 0
+    for _, arcname, size in members:
+        header_length, total_length = _member_lengths(arcname, size, fmt)
+        offsets.append(position + header_length)
+        if fmt == 'zip':
+            # 中央目录位于所有成员数据之后
+            position += header_length + size + 16
+            central += total_length - header_length - size - 16
+        else:
+            position += total_length
+    if fmt == 'zip':
+        return position + central + 22, offsets
+    # tar 结尾是两个空块，并补齐到记录大小
+    position += 2 * tarfile.BLOCKSIZE
+    return -(-position // tarfile.RECORDSIZE) * tarfile.RECORDSIZE, offsets
+
+def _zip_member(arcname: str, mtime: float = None) -> zipfile.ZipInfo:
+    """构造zip成员信息，时间戳为文件的修改时间(默认当前时间)
+    zip 只能记录 1980 到 2107 年之间的时间，超出范围时取边界值；时间戳不影响成员头的长度，布局可以预先计算
+    """
+    date_time = time.localtime(mtime)[:6]
+    date_time = min(max(date_time, (1980, 1, 1, 0, 0, 0)), (2107, 12, 31, 23, 59, 58))
+    return zipfile.ZipInfo(arcname.replace(os.sep, '/').lstrip('/'), date_time)
+
+def _tar_member(arcname: str, size: int, mtime: float = None) -> tarfile.TarInfo:
+    """构造tar成员信息，时间戳为文件的修改时间(默认当前时间)
+    取整并且不早于 1970 年，否则 PAX 格式会多写一条 mtime 记录，成员头的长度就与预先计算的布局不一致
+    """
+    info = tarfile.TarInfo(arcname.replace(os.sep, '/').lstrip('/'))
+    info.size = size
+    info.mode = 0o644
+    info.mtime = max(0, int(time.time() if mtime is None else mtime))
+    return info
+
+def stream_pack(members: List[Tuple[str, str, int]], fmt: str):
+    """在后台线程中把成员文件写成归档，返回归档内容的块迭代器，全程不落盘"""
+    pipe = _ChunkPipe()
+
+    def writer():
+        try:
+            if fmt == 'zip':
+                with zipfile.ZipFile(pipe, 'w', zipfile.ZIP_STORED) as archive:
+                    for path, arcname, size in members:
+                        with open(path, 'rb') as src:
+                            member = _zip_member(arcname, os.fstat(src.fileno()).st_mtime)
+                            member.file_size = size
+                            with archive.open(member, 'w') as dst:
+                                for chunk in iter_file_chunks(src):
+                                    dst.write(chunk)
+            else:
+                with tarfile.open(fileobj=pipe, mode='w|', format=tarfile.PAX_FORMAT, encoding='utf-8') as archive:
+                    for path, arcname, size in members:
+                        with open(path, 'rb') as src:
+                            archive.addfile(_tar_member(arcname, size, os.fstat(src.fileno()).st_mtime), src)
+            pipe.close_with(None)
+        except Exception as e:
+            pipe.close_with(IOError(f"打包失败: {str(e)}"))
+
+    threading.Thread(target=writer, daemon=True).start()
+    return iter(pipe)
+
+class TokenBucket:
+    """令牌桶限速器
+    所有并发传输共享同一个桶，每发送一块数据前先预约对应数量的令牌，令牌不足时按预约的先后顺序等待。
+    总速率不会超过限制，并发的传输之间按块轮流获得带宽。
+    """
+    def __init__(self, rate: int, burst: int = None):
+        self.rate = rate  # 每秒字节数，不大于 0 时不限速
+        self.burst = burst or max(rate // 4, UPLOAD_CHUNK_SIZE)  # 桶容量
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        """取出 amount 个令牌，不足时阻塞到令牌补足"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # 先记账再等待，令牌可以透支，后来者需要等前面的透支补齐，保证先到先得
+            self._tokens -= amount
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def throttle(self, chunks):
+        """包装字节块迭代器，按限速发送"""
+        # 限速很低时把大块拆小，避免长时间停顿后突发发送
+        piece_size = max(1024, min(UPLOAD_CHUNK_SIZE, self.rate // 10)) if self.rate > 0 else UPLOAD_CHUNK_SIZE
+        for chunk in chunks:
+            view = memoryview(chunk)
+            for start in range(0, len(view), piece_size):
+                piece = view[start:start + piece_size]
+                self.consume(len(piece))
+                yield piece.tobytes() if len(view) > piece_size else chunk
+
+def make_rate_limiter(limit) -> Optional[TokenBucket]:
+    """根据限速参数(如 "20M" 或字节数)创建 TokenBucket，为空或不大于 0 时返回 None 表示不限速
+
+    Raises:
+        ValueError: 限速参数无法解析
+    """
+    if not limit:
+        return None
+    rate = parse_size_arg(limit) if isinstance(limit, str) else int(limit)
+    return TokenBucket(rate) if rate > 0 else None
+
+def plan_packs(members: List[Tuple[str, str, int]], max_size: int, fmt: str) -> List[List[Tuple[str, str, int]]]:
+    """按顺序把小文件分组，保证每个归档的总大小不超过 max_size，zip 归档的成员数不超过 ZIP_MAX_MEMBERS"""
+    # 归档结尾的固定开销，tar 按最坏情况的记录补齐计算
+    trailer = 22 if fmt == 'zip' else 2 * tarfile.BLOCKSIZE + tarfile.RECORDSIZE
+    packs = []
+    current = []
+    total = trailer
+    for member in members:
+        length = _member_lengths(member[1], member[2], fmt)[1]
+        if current and (total + length > max_size or (fmt == 'zip' and len(current) >= ZIP_MAX_MEMBERS)):
+            packs.append(current)
+            current = []
+            total = trailer
+        current.append(member)
+        total += length
+    if current:
+        packs.append(current)
+    return packs
+
+# 目录监视
+WATCH_IGNORE = ('.*', '*~', '*.swp', '*.tmp', '*.part', '*.crdownload')  # 编辑器和下载工具的临时文件
+WATCH_OPEN_TIMEOUT = 60.0  # 没有收到写入完成事件的文件，静默这么久后也视为写完
+WATCH_MAX_DELAY = 10.0  # 目录持续有变化时，就绪的文件最多再等这么久就开始上传
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVE_SELF
+
+class _Inotify:
+    """通过 ctypes 调用 Linux inotify 接口"""
+    _event = struct.Struct('iIII')  # wd, mask, cookie, len
+
     def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+
+    def add_watch(self, path: str, mask: int = WATCH_EVENTS) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"无法监视目录: {path}")
+        return wd
+
+    def remove_watch(self, wd: int):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """读取当前已有的事件，返回 [(wd, mask, 文件名)]"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._event.unpack_from(data, offset)
+                offset += self._event.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self):
+        os.close(self.fd)
+
+class DirectoryWatcher:
+    """监视本地目录树中新增或修改的文件
+    Linux 上使用 inotify，只在有事件时才被唤醒，开销与实际变化量成正比；其他系统退回到定时扫描比较文件的大小和修改时间。
+    同一文件的多次事件合并为一条待上传记录，文件写完(收到 IN_CLOSE_WRITE 或移入目录)并静默 settle 秒后才视为就绪。
+    整个目录静默 settle 秒后，所有就绪的文件作为一批返回，因此一次性复制进来的大量文件会合并成一批；
+    目录一直有变化时，最早就绪的文件最多等待 WATCH_MAX_DELAY 秒。
+    """
+    def __init__(self, root: str, settle: float = 2.0, poll_interval: float = 5.0, ignore=WATCH_IGNORE,
+                 on_warning=None):
+        self.root = os.path.abspath(root)
+        self.on_warning = on_warning  # 无法监视某个子目录时以错误信息调用
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.ignore = ignore
+        self._pending = {}  # 相对路径 -> [最后一次事件的时间, 是否已写完]
+        self._last_event = 0.0  # 目录中最后一次有文件变化的时间
+        self._watches = {}  # inotify wd -> 相对目录
+        self._inotify = None
+        if sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None  # 找不到 libc 或超出 inotify 实例数限制
+        self.backend = 'inotify' if self._inotify else 'poll'
+        if self._inotify:
+            self._watch_tree('')
+        else:
+            self._snapshot = self._stat_tree()
+
+    def _ignored(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.ignore)
+
+    def scan(self) -> List[str]:
+        """列出目录树中所有未被忽略的文件(相对路径)"""
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(name for name in dirnames if not self._ignored(name))
+            rel_dir = os.path.relpath(dirpath, self.root)
+            for name in sorted(filenames):
+                if not self._ignored(name):
+                    files.append(os.path.normpath(os.path.join(rel_dir, name)))
+        return files
+
+    def _stat_tree(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for rel_path in self.scan():
+            try:
+                stat = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                continue
+            snapshot[rel_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _watch_tree(self, rel_dir: str, mark_files: bool = False):
+        """监视 rel_dir 及其所有子目录，mark_files 为真时把其中已有的文件加入待上传
+        (新建或移入的目录在添加监视之前可能已经写入了文件)
+        """
+        top = os.path.join(self.root, rel_dir)
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [name for name in dirnames if not self._ignored(name)]
+            rel = os.path.normpath(os.path.relpath(dirpath, self.root))
+            try:
+                self._watches[self._inotify.add_watch(dirpath)] = '' if rel == '.' else rel
+            except OSError as e:
+                if self.on_warning:
+                    self.on_warning(str(e))
+                continue
+            if mark_files:
+                for name in filenames:
+                    if not self._ignored(name):
+                        self._touch(os.path.join('' if rel == '.' else rel, name), True)
+
+    def _touch(self, rel_path: str, complete: bool):
+        self._last_event = time.monotonic()
+        self._pending[rel_path] = [self._last_event, complete]
+
+    def _handle_events(self):
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # 事件队列溢出，丢失的变化无法得知，重新登记所有文件，由调用方按上传记录过滤
+                for rel_path in self.scan():
+                    self._touch(rel_path, True)
+                continue
+            if mask & (IN_IGNORED | IN_MOVE_SELF):
+                # 目录被删除或移走，移走的目录若仍在监视范围内会以 IN_MOVED_TO 重新添加
+                if wd in self._watches:
+                    del self._watches[wd]
+                    if mask & IN_MOVE_SELF:
+                        self._inotify.remove_watch(wd)
+                continue
+            rel_dir = self._watches.get(wd)
+            if rel_dir is None or not name or self._ignored(name):
+                continue
+            rel_path = os.path.join(rel_dir, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(rel_path, mark_files=True)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._pending.pop(rel_path, None)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self._touch(rel_path, True)
+            else:
+                self._touch(rel_path, False)
+
+    def _poll(self):
+        snapshot = self._stat_tree()
+        for rel_path, state in snapshot.items():
+            if self._snapshot.get(rel_path) != state:
+                self._touch(rel_path, True)
+        for rel_path in self._snapshot.keys() - snapshot.keys():
+            self._pending.pop(rel_path, None)
+        self._snapshot = snapshot
+
+    def requeue(self, paths: List[str], delay: float):
+        """把处理失败的文件重新加入待上传，delay 秒后再次就绪
+        文件在此期间又有变化时以新的事件为准。
+        """
+        ready_at = time.monotonic() + delay
+        for rel_path in paths:
+            if rel_path not in self._pending:
+                # 不更新 _last_event: 这不是目录中的新变化，就绪后不需要再等目录静默
+                self._pending[rel_path] = [ready_at - self.settle, True]
+
+    def _ready_at(self, entry) -> float:
+        last_event, complete = entry
+        return last_event + (self.settle if complete else max(self.settle, WATCH_OPEN_TIMEOUT))
+
+    def wait_batch(self, timeout: float = None) -> List[str]:
+        """等待下一批就绪的文件
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+        Returns:
+            List[str]: 就绪文件的相对路径，超时返回空列表
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            ready_times = {path: self._ready_at(entry) for path, entry in self._pending.items()}
+            ready = sorted(path for path, ready_at in ready_times.items() if ready_at <= now)
+            if ready:
+                # 等目录静默后再返回，把同一波变化合并成一批
+                flush_at = min(self._last_event + self.settle, min(ready_times[path] for path in ready) + WATCH_MAX_DELAY)
+                if flush_at <= now:
+                    for path in ready:
+                        del self._pending[path]
+                    return ready
+                wake_times = [flush_at]
+            else:
+                wake_times = list(ready_times.values())
+            if deadline is not None and now >= deadline:
+                return []
+            
+            # 睡到下一批可能就绪、超时或有新事件为止，没有待处理的文件时不会定时唤醒
+            if deadline is not None:
+                wake_times.append(deadline)
+            delay = max(0.0, min(wake_times) - now) if wake_times else None
+            if self._inotify:
+                readable, _, _ = select.select([self._inotify.fd], [], [], delay)
+                if readable:
+                    self._handle_events()
+            else:
+                time.sleep(self.poll_interval if delay is None else min(delay, self.poll_interval))
+                self._poll()
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+def format_remote_path(stack: list, current: tuple) -> str:
+    """把 (上级目录栈, (文件夹ID, 名称)) 格式化为 /根目录/a/b 形式的完整路径"""
+    if not stack:
+        return "/根目录"
+    return "/" + "/".join([name for _, name in stack] + [current[1]])
+
+class LanZouWeb:
+    """蓝奏云网页版客户端
+    方法本身不输出任何内容：成功时返回结果，失败时抛出 LanZouError 的子类。
+    需要展示进度时传入 on_event(event, info) 回调，info 为字典，事件包括:
+        transfer_start     {'transfer', 'name', 'size', 'folder_id'}  开始传输一个文件
+        transfer_progress  {'transfer', 'bytes'}  又发送了 bytes 字节
+        transfer_end       {'transfer', 'file_id', 'error'}  传输结束，失败时 file_id 为 None
+        retry              {'description', 'attempt', 'delay', 'error'}  某个阶段失败，等待后重试
+        folder_created     {'folder'}  新建了文件夹
+        pack_start         {'archive', 'count', 'size'}  开始上传一个归档
+        session_renewed    {'source'}  登录过期后已自动恢复，'cookie' 表示复用了其他进程刷新的 cookie.json，'password' 表示重新登录
+        warning            {'message'}  不影响结果的问题，如缓存文件损坏
+    未设置回调时不会产生任何进度统计的开销。
+    客户端不保存"当前目录"，可以在多个线程间共用；cd/pwd 等导航状态由 NavigationContext 保存。
+    """
+    def __init__(self, config: Dict = None, on_event=None):
+        """
+        Args:
+            config: 配置字典，默认使用 config.py 中的 LANZOU_CONFIG
+            on_event: 事件回调 on_event(event, info)
+        Raises:
+            ConfigError: 缺少 uid 或配置值无效
+        """
+        config = LANZOU_CONFIG if config is None else config
+        self.on_event = on_event
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.39 (KHTML, like Gecko) Chrome/89.0.4389.111 Safari/537.39'
@@ -58,565 +942,1564 @@ class LanZouWeb:
         self.cookie_file = 'cookie.json'
         self.is_login = False
         self.user_info = {
-            'uid': LANZOU_CONFIG.get('uid', '')  # 从配置文件获取uid
+            'uid': config.get('uid', '')  # 从配置文件获取uid
         }
         self.root_folder_id = "-1"  # 根目录ID
         
         # 检查必要的配置
         if not self.user_info['uid']:
-            print(f"{RED}✗ 请在config.py中配置你的uid{RESET}")
-            print(f"{CYAN}uid可以从浏览器F12开发者工具中获取，位于网络请求的URL参数中{RESET}")
-            sys.exit(1)
+            raise ConfigError("请在config.py中配置你的uid")
         
-        # 目录导航
-        self.current_folder_id = self.root_folder_id  # 当前目录ID
-        self.current_folder_name = "根目录"  # 当前目录名称
-        self.folder_stack = []  # 目录栈，用于返回上级目录
+        # 并发请求与目录缓存
+        self.max_workers = int(config.get('max_workers', 4))  # 最大并发请求数
+        self._request_slots = threading.BoundedSemaphore(self.max_workers)
+        # 连接池: 接口请求最多 max_workers 个，并发上传通常不超过同样的数量，池再小就会反复建立连接
+        adapter = HTTPAdapter(pool_maxsize=2 * self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # 保护 cookie 的加载、保存和替换，同时也是 cookie jar 自身的锁，requests 合并响应 cookie 时同样持有
+        self._cookie_lock = threading.RLock()
+        self.session.cookies = LockedCookieJar(self._cookie_lock)
+        # 登录过期后自动重新登录: 同一时刻只有一个线程登录，其他线程等待并复用结果
+        self._login_lock = threading.RLock()
+        self._credentials = None  # login 时记录的 (用户名, 密码)
+        self.session_generation = 0  # 每次登录或加载 cookie 成功后加1，用来判断过期后是否已经有人重新登录过
+        self._cache_lock = threading.Lock()
+        self._folder_cache = {}  # 文件夹ID -> 子文件夹列表
+        self._file_cache = {}  # 文件夹ID -> 文件列表
+        self._indexes = {}  # 文件夹ID -> 该目录树的FileIndex
+        self._prefetch_queue = None  # 后台预取队列，首次预取时创建
+        self._prefetching = set()  # 正在预取的文件夹ID
+        self.share_cache_file = 'share_cache.json'
+        self._share_cache = None  # 文件ID -> 分享信息，首次使用时从文件加载
+        self.pack_manifest_file = 'pack_manifest.json'
+        self._transfer_ids = itertools.count(1)  # transfer 事件中的传输编号
         
-    def get_current_path(self) -> str:
-        """获取当前完整路径"""
-        if not self.folder_stack:
-            return "/根目录"
-        
-        path = ""
-        # 添加目录栈中的路径
-        for folder_id, name in self.folder_stack:
-            path += f"/{name}"
-        # 添加当前目录
-        path += f"/{self.current_folder_name}"
-        return path
-        
-    def cd(self, folder_name: str) -> bool:
-        """进入指定目录
-        Args:
-            folder_name: 目录名称，可以是 ".." 返回上级目录
-        Returns:
-            bool: 是否成功
-        """
-        if not self.is_login:
-            print("✗ 请先登录")
-            return False
-            
+        # 上传限速，所有传输共享
         try:
-            # 返回上级目录
-            if folder_name == "..":
-                if not self.folder_stack:
-                    print("✗ 已经在根目录")
-                    return False
-                self.current_folder_id, self.current_folder_name = self.folder_stack.pop()
-                print(f"✓ 返回上级目录: {self.get_current_path()}")
-                return True
-                
-            # 获取当前目录下的所有文件夹
-            folders = self.get_folders(self.current_folder_id)
-            
-            # 查找目标文件夹
-            target_folder = None
-            for folder in folders:
-                if folder.name == folder_name:
-                    target_folder = folder
-                    break
-                    
-            if not target_folder:
-                print(f"✗ 目录不存在: {folder_name}")
-                return False
-                
-            # 保存当前目录到栈中
-            self.folder_stack.append((self.current_folder_id, self.current_folder_name))
+            self.rate_limiter = make_rate_limiter(config.get('upload_limit'))
+        except ValueError as e:
+            raise ConfigError(f"upload_limit 配置无效: {str(e)}")
+        # 上传本地文件的传输方式: requests(默认) 或 sendfile(零拷贝，只对 http 地址生效，如内网镜像或反向代理)
+        self.upload_transport = config.get('upload_transport', 'requests')
+        if self.upload_transport not in UPLOAD_TRANSPORTS:
+            raise ConfigError(f"不支持的上传传输方式: {self.upload_transport}")
+        
+    def _emit(self, event: str, **info):
+        """调用事件回调"""
+        if self.on_event:
+            self.on_event(event, info)
+            
+    def _post(self, url: str, data: Dict = None, files: Dict = None, **kwargs) -> Dict:
+        """发送POST请求并处理响应，登录过期时自动重新登录并重发一次
+        Raises:
+            RequestError: 网络错误、HTTP 错误或服务器返回失败
+            LoginError: 登录已过期且无法重新登录
+        """
+        # 在URL中添加uid参数
+        if '?' in url:
+            url = f"{url}&uid={self.user_info['uid']}"
+        else:
+            url = f"{url}?uid={self.user_info['uid']}"
             
-            # 更新当前目录
-            self.current_folder_id = target_folder.folder_id
-            self.current_folder_name = target_folder.name
+        generation = self.session_generation
+        result = self._post_json(url, data, files, **kwargs)
+        if session_expired(result):
+            self.renew_session(generation)
+            result = self._post_json(url, data, files, **kwargs)
+            if session_expired(result):
+                raise LoginError(f"重新登录后仍然提示未登录: {result.get('info', '')}")
             
-            print(f"✓ 进入目录: {self.get_current_path()}")
-            print(f"✓ 目录ID: {self.current_folder_id}")
-            return True
+        # 如果是获取文件夹列表的请求,特殊处理
+        if data and data.get("task") == "47":
+            return result
             
-        except Exception as e:
-            print(f"✗ 进入目录失败: {str(e)}")
-            return False
+        if result.get('zt') != 1:
+            raise RequestError(f"请求出错: {result.get('info', '未知错误')}")
             
-    def pwd(self):
-        """显示当前目录路径"""
-        print(f"\n当前位置: {self.get_current_path()}")
-        print(f"目录ID: {self.current_folder_id}")
+        return result
         
-    def _post(self, url: str, data: Dict = None, files: Dict = None, **kwargs) -> Dict:
-        """发送POST请求并处理响应"""
+    def _post_json(self, url: str, data: Dict = None, files: Dict = None, **kwargs) -> Dict:
+        """发送POST请求并解析JSON响应，被重定向到登录页面时返回 zt 为 9 的结果"""
         try:
-            # 在URL中添加uid参数
-            if '?' in url:
-                url = f"{url}&uid={self.user_info['uid']}"
-            else:
-                url = f"{url}?uid={self.user_info['uid']}"
-                
-            response = self.session.post(url, data=data, files=files, **kwargs)
-            if response.status_code != 200:
-                raise Exception(f"请求失败: HTTP {response.status_code}")
-                
-            result = response.json()
-            # 如果是获取文件夹列表的请求,特殊处理
-            if data and data.get("task") == "47":
-                return result
-                
-            if result.get('zt') != 1:
-                raise Exception(result.get('info', '未知错误'))
-                
-            return result
-        except Exception as e:
-            raise Exception(f"请求出错: {str(e)}")
+            with self._request_slots:
+                response = self.session.post(url, data=data, files=files, **kwargs)
+        except requests.RequestException as e:
+            raise RequestError(f"请求出错: {str(e)}")
+        if response.status_code != 200:
+            raise RequestError(f"请求出错: HTTP {response.status_code}")
+        # requests 的 JSONDecodeError 同时继承 RequestException 和 ValueError，要单独处理
+        try:
+            return response.json()
+        except ValueError:
+            if "登录" in response.text:
+                return {'zt': 9, 'info': "登录已过期"}
+            raise RequestError("请求出错: 服务器返回的不是JSON")
             
-    def get_folders(self, parent_id: str = None) -> List[FolderInfo]:
+            
+    def get_folders(self, parent_id: str = None, use_cache: bool = False) -> List[FolderInfo]:
         """获取文件夹列表
         Args:
             parent_id: 父文件夹ID，默认根目录
+            use_cache: 是否优先使用已缓存的列表
         Returns:
             List[FolderInfo]: 文件夹列表
+        Raises:
+            RequestError: 获取失败
         """
         if parent_id is None:
             parent_id = self.root_folder_id
             
         if not self.is_login:
-            raise Exception("请先登录")
-            
-        try:
-            result = self._post(
-                self.doupload_url,
-                data={
-                    "task": "47",
-                    "folder_id": parent_id
-                }
-            )
+            raise LoginError("请先登录")
             
+        if use_cache:
+            with self._cache_lock:
+                if parent_id in self._folder_cache:
+                    return list(self._folder_cache[parent_id])
+                    
+        result = self._post(
+            self.doupload_url,
+            data={
+                "task": "47",
+                "folder_id": parent_id
+            }
+        )
+        
+        folders = []
+        text = result.get('text', [])
+        # 如果text是列表,说明有子文件夹
+        if isinstance(text, list):
+            for item in text:
+                # 修正文件夹ID字段
+                if 'folderid' in item:
+                    item['folder_id'] = item['folderid']
+                folders.append(FolderInfo(item))
+        # 如果text不是列表但有folderid字段,说明是空文件夹
+        elif isinstance(text, dict) and 'folderid' in text:
             folders = []
-            text = result.get('text', [])
-            # 如果text是列表,说明有子文件夹
-            if isinstance(text, list):
-                for item in text:
-                    # 修正文件夹ID字段
-                    if 'folderid' in item:
-                        item['folder_id'] = item['folderid']
-                    folders.append(FolderInfo(item))
-            # 如果text不是列表但有folderid字段,说明是空文件夹
-            elif isinstance(text, dict) and 'folderid' in text:
-                return []
-                
-            return folders
             
-        except Exception as e:
-            print(f"✗ 获取文件夹列表失败: {str(e)}")
-            return []
+        with self._cache_lock:
+            self._folder_cache[parent_id] = list(folders)
+        return folders
             
-    def get_files(self, folder_id: str = None) -> List[FileInfo]:
+    def get_files(self, folder_id: str = None, use_cache: bool = False) -> List[FileInfo]:
         """获取文件列表
         Args:
             folder_id: 文件夹ID，默认根目录
+            use_cache: 是否优先使用已缓存的列表
         Returns:
             List[FileInfo]: 文件列表
+        Raises:
+            RequestError: 获取失败
         """
         if folder_id is None:
             folder_id = self.root_folder_id
             
         if not self.is_login:
-            raise Exception("请先登录")
+            raise LoginError("请先登录")
             
-        try:
-            files = []
-            page = 1
+        if use_cache:
+            with self._cache_lock:
+                if folder_id in self._file_cache:
+                    return list(self._file_cache[folder_id])
+                    
+        files = []
+        page = 1
+        
+        while True:
+            # 完全按照浏览器F12看到的请求参数构造
+            result = self._post(
+                self.doupload_url,
+                data={
+                    "task": "5",
+                    "folder_id": folder_id,
+                    "pg": str(page),
+                    "uid": self.user_info['uid']  # 使用配置文件中的uid
+                },
+                headers={
+                    'Accept': 'application/json, text/javascript, */*; q=0.01',
+                    'Accept-Language': 'zh-CN,zh;q=0.9',
+                    'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+                    'Origin': 'https://up.woozooo.com',
+                    'Referer': 'https://up.woozooo.com/mydisk.php',
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            )
             
-            while True:
-                # 完全按照浏览器F12看到的请求参数构造
-                result = self._post(
-                    self.doupload_url,
-                    data={
-                        "task": "5",
-                        "folder_id": folder_id,
-                        "pg": str(page),
-                        "uid": self.user_info['uid']  # 使用配置文件中的uid
-                    },
-                    headers={
-                        'Accept': 'application/json, text/javascript, */*; q=0.01',
-                        'Accept-Language': 'zh-CN,zh;q=0.9',
-                        'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
-                        'Origin': 'https://up.woozooo.com',
-                        'Referer': 'https://up.woozooo.com/mydisk.php',
-                        'X-Requested-With': 'XMLHttpRequest'
-                    }
-                )
+            text = result.get('text', [])
+            # 如果text不是列表或者是空字符串,说明没有文件
+            if not isinstance(text, list) or text == "" or not text:
+                break
                 
-                text = result.get('text', [])
-                # 如果text不是列表或者是空字符串,说明没有文件
-                if not isinstance(text, list) or text == "" or not text:
-                    break
-                    
-                for item in text:
-                    files.append(FileInfo(item))
-                    
-                # 检查是否有更多页
-                if len(text) < 50:  # 通常每页50条记录
-                    break
-                    
-                page += 1
-                time.sleep(0.5)  # 添加延时，避免请求过快
+            for item in text:
+                files.append(FileInfo(item))
                 
-            return files
+            # 检查是否有更多页
+            if len(text) < 50:  # 通常每页50条记录
+                break
+                
+            page += 1
             
-        except Exception as e:
-            print(f"✗ 获取文件列表失败: {str(e)}")
-            return []
+        with self._cache_lock:
+            self._file_cache[folder_id] = list(files)
+        return files
+            
+    def invalidate_cache(self, folder_id: str = None):
+        """使目录缓存失效
+        Args:
+            folder_id: 文件夹ID，为None时清空全部缓存
+        """
+        with self._cache_lock:
+            if folder_id is None:
+                self._folder_cache.clear()
+                self._file_cache.clear()
+            else:
+                self._folder_cache.pop(folder_id, None)
+                self._file_cache.pop(folder_id, None)
+            # 目录树发生变化，已建立的索引不再可靠
+            self._indexes.clear()
+            
+    def peek_cache(self, folder_id: str) -> Tuple[Optional[List[FolderInfo]], Optional[List[FileInfo]]]:
+        """读取已缓存的目录列表，不发起网络请求
+        Returns:
+            Tuple: (子文件夹列表, 文件列表)，未缓存的部分为None
+        """
+        with self._cache_lock:
+            folders = self._folder_cache.get(folder_id)
+            files = self._file_cache.get(folder_id)
+            return (list(folders) if folders is not None else None,
+                    list(files) if files is not None else None)
+            
+    def prefetch(self, folder_id: str, depth: int = 1):
+        """在后台线程中预先获取目录列表，之后的 cd、补全等可以直接使用缓存
+        Args:
+            folder_id: 文件夹ID
+            depth: 继续预取的子目录层数，1 表示同时预取直接子目录
+        """
+        with self._cache_lock:
+            if folder_id in self._prefetching:
+                return
+            self._prefetching.add(folder_id)
+            if self._prefetch_queue is None:
+                self._prefetch_queue = queue.Queue()
+                for _ in range(2):
+                    threading.Thread(target=self._prefetch_worker, daemon=True).start()
+        self._prefetch_queue.put((folder_id, depth))
+        
+    def _prefetch_worker(self):
+        """预取线程，已缓存的目录不会重复请求"""
+        while True:
+            folder_id, depth = self._prefetch_queue.get()
+            try:
+                folders = self.get_folders(folder_id, use_cache=True)
+                self.get_files(folder_id, use_cache=True)
+                if depth > 0:
+                    for folder in folders:
+                        self.prefetch(folder.folder_id, depth - 1)
+            except Exception:
+                pass
+            finally:
+                with self._cache_lock:
+                    self._prefetching.discard(folder_id)
+                    
+    def _forget_file(self, file_id: str) -> bool:
+        """从缓存的文件列表和分享链接缓存中移除指定文件
+        Returns:
+            bool: 分享链接缓存是否有变化，需要调用 save_share_cache 保存
+        """
+        with self._cache_lock:
+            for folder_id, files in self._file_cache.items():
+                self._file_cache[folder_id] = [f for f in files if f.id != file_id]
+            self._indexes.clear()
+            return self._load_share_cache().pop(file_id, None) is not None
+            
+    def _forget_folder(self, folder_id: str):
+        """从缓存的文件夹列表中移除指定文件夹"""
+        with self._cache_lock:
+            for parent_id, folders in self._folder_cache.items():
+                self._folder_cache[parent_id] = [f for f in folders if f.folder_id != folder_id]
+            self._folder_cache.pop(folder_id, None)
+            self._file_cache.pop(folder_id, None)
+            self._indexes.clear()
+            
+    def _move_cached_file(self, file_id: str, folder_id: str):
+        """在缓存中把文件从原目录移到目标目录，两边的列表都无需重新获取
+        缓存中的 FileInfo 可能已经交给了调用方，这里替换为副本，不修改原对象
+        """
+        with self._cache_lock:
+            moved = None
+            for source_id, files in self._file_cache.items():
+                moved = next((file for file in files if file.id == file_id), None)
+                if moved:
+                    self._file_cache[source_id] = [file for file in files if file is not moved]
+                    break
+            if moved and folder_id in self._file_cache:
+                moved = copy.copy(moved)
+                moved.folder_id = folder_id
+                self._file_cache[folder_id] = self._file_cache[folder_id] + [moved]
+            elif folder_id in self._file_cache:
+                # 原目录未缓存，无法得知文件信息，只能让目标目录重新获取
+                self._file_cache.pop(folder_id)
+            self._indexes.clear()
             
-    def create_folder(self, folder_name: str, parent_id: str = None, description: str = "") -> Optional[FolderInfo]:
+    def create_folder(self, folder_name: str, parent_id: str = None, description: str = "") -> FolderInfo:
         """创建文件夹
         Args:
             folder_name: 文件夹名称
             parent_id: 父文件夹ID，默认根目录
             description: 文件夹描述
         Returns:
-            Optional[FolderInfo]: 创建成功返回文件夹信息，失败返回None
+            FolderInfo: 新建的文件夹
+        Raises:
+            RequestError: 创建失败
         """
         if parent_id is None:
             parent_id = self.root_folder_id
             
         if not self.is_login:
-            raise Exception("请先登录")
+            raise LoginError("请先登录")
             
-        try:
-            print(f"\n[创建文件夹]")
-            print(f"文件夹名称: {folder_name}")
-            print(f"父目录ID: {parent_id}")
+        result = self._post(
+            self.doupload_url,
+            data={
+                "task": "2",
+                "parent_id": parent_id,
+                "folder_name": folder_name,
+                "folder_description": description
+            }
+        )
+        
+        folder_id = result.get('text')
+        self.invalidate_cache(parent_id)
+        if not folder_id:
+            raise RequestError("创建失败，无法获取文件夹ID")
+        folder = FolderInfo({
+            'name': folder_name,
+            'folder_id': folder_id,
+            'folder_des': description
+        })
+        self._emit('folder_created', folder=folder)
+        return folder
             
-            result = self._post(
-                self.doupload_url,
-                data={
-                    "task": "2",
-                    "parent_id": parent_id,
-                    "folder_name": folder_name,
-                    "folder_description": description
-                }
-            )
-            
-            folder_id = result.get('text')
-            if folder_id:
-                folder = FolderInfo({
-                    'name': folder_name,
-                    'folder_id': folder_id,
-                    'folder_des': description
-                })
-                print(f"✓ 创建成功，文件夹ID: {folder_id}")
-                return folder
-                
-            print("✗ 创建失败，无法获取文件夹ID")
-            return None
-            
-        except Exception as e:
-            print(f"✗ 创建文件夹失败: {str(e)}")
-            return None
-            
-    def delete_file(self, file_id: str) -> bool:
+    def delete_file(self, file_id: str):
         """删除文件
         Args:
             file_id: 文件ID
-        Returns:
-            bool: 是否删除成功
+        Raises:
+            RequestError: 删除失败
         """
         if not self.is_login:
-            raise Exception("请先登录")
+            raise LoginError("请先登录")
             
-        try:
-            print(f"\n[删除文件]")
-            print(f"文件ID: {file_id}")
+        self._post(
+            self.doupload_url,
+            data={
+                "task": "6",
+                "file_id": file_id
+            }
+        )
+        if self._forget_file(file_id):
+            self.save_share_cache()
             
-            self._post(
-                self.doupload_url,
-                data={
-                    "task": "6",
-                    "file_id": file_id
-                }
-            )
+    def move_file(self, file_id: str, folder_id: str):
+        """在服务器端移动文件，无需重新上传
+        Args:
+            file_id: 文件ID
+            folder_id: 目标文件夹ID
+        Raises:
+            RequestError: 移动失败
+        """
+        if not self.is_login:
+            raise LoginError("请先登录")
             
-            print(f"✓ 删除成功")
-            return True
+        self._post(
+            self.doupload_url,
+            data={
+                "task": "20",
+                "folder_id": folder_id,
+                "file_id": file_id
+            }
+        )
+        self._move_cached_file(file_id, folder_id)
             
-        except Exception as e:
-            print(f"✗ 删除文件失败: {str(e)}")
-            return False
+    def move_files(self, file_ids: List[str], folder_id: str, callback=None) -> Dict[str, Optional[LanZouError]]:
+        """并发移动多个文件，并发数受 max_workers 共享请求配额限制
+        Args:
+            file_ids: 文件ID列表
+            folder_id: 目标文件夹ID
+            callback: 每完成一个文件后调用，参数为 (文件ID, 错误)，成功时错误为None
+        Returns:
+            Dict[str, Optional[LanZouError]]: 文件ID -> 错误，移动成功为None
+        """
+        def move(file_id):
+            try:
+                self.move_file(file_id, folder_id)
+            except LanZouError as e:
+                return e
+            return None
             
-    def delete_folder(self, folder_id: str) -> bool:
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(move, file_id): file_id for file_id in file_ids}
+            for future in as_completed(futures):
+                file_id = futures[future]
+                results[file_id] = future.result()
+                if callback:
+                    callback(file_id, results[file_id])
+        return results
+        
+    def delete_folder(self, folder_id: str):
         """删除文件夹
         Args:
             folder_id: 文件夹ID
-        Returns:
-            bool: 是否删除成功
+        Raises:
+            RequestError: 删除失败
         """
         if not self.is_login:
-            raise Exception("请先登录")
+            raise LoginError("请先登录")
             
-        try:
-            print(f"\n[删除文件夹]")
-            print(f"文件夹ID: {folder_id}")
-            
-            self._post(
-                self.doupload_url,
-                data={
-                    "task": "3",
-                    "folder_id": folder_id
-                }
-            )
-            
-            print(f"✓ 删除成功")
-            return True
-            
-        except Exception as e:
-            print(f"✗ 删除文件夹失败: {str(e)}")
-            return False
+        self._post(
+            self.doupload_url,
+            data={
+                "task": "3",
+                "folder_id": folder_id
+            }
+        )
+        self._forget_folder(folder_id)
             
-    def list_dir(self, folder_id: str = None):
+    def list_dir(self, folder_id: str) -> Tuple[List[FolderInfo], List[FileInfo]]:
         """列出目录内容
         Args:
-            folder_id: 文件夹ID，默认当前目录
+            folder_id: 文件夹ID
+        Returns:
+            Tuple: (子文件夹列表, 文件列表)
         """
-        if folder_id is None:
-            folder_id = self.current_folder_id
-            
-        try:
-            print(f"\n{BLUE}=== 目录内容: {self.get_current_path()} ==={RESET}")
-            
-            # 获取文件夹
-            folders = self.get_folders(folder_id)
-            if folders:
-                print("\n[文件夹]")
-                for folder in folders:
-                    print(f"├─ {folder}")
-                    
-            # 获取文件
-            files = self.get_files(folder_id)
-            if files:
-                print("\n[文件]")
-                for file in files:
-                    print(f"├─ {file}")
-                    
-            if not folders and not files:
-                print("\n目录为空")
-                
-        except Exception as e:
-            print(f"{RED}✗ 获取目录内容失败: {str(e)}{RESET}")
-            
+        return self.get_folders(folder_id), self.get_files(folder_id)
+
+    def resolve_path(self, path: str, cache_only: bool = False) -> Optional[Tuple[str, str]]:
+        """解析从根目录开始的网盘路径，相对路径请使用 NavigationContext.resolve_path
+        Args:
+            path: 网盘路径，支持 . 和 ..
+            cache_only: 只使用已缓存的目录列表，不发起网络请求
+        Returns:
+            Optional[Tuple[str, str]]: (文件夹ID, 完整路径)，目录不存在返回None
+        """
+        resolved = self.walk_path(path, cache_only=cache_only)
+        if not resolved:
+            return None
+        stack, current = resolved
+        return current[0], format_remote_path(stack, current)
+        
+    def find_folder(self, parent_id: str, name: str) -> Optional[FolderInfo]:
+        """在 parent_id 下按名称查找子文件夹
+        优先使用缓存；缓存中没有时重新获取一次列表，以免找不到缓存之后在网页上新建的文件夹
+        Returns:
+            Optional[FolderInfo]: 找不到时返回None
+        """
+        cached = self.peek_cache(parent_id)[0]
+        if cached is not None:
+            for folder in cached:
+                if folder.name == name:
+                    return folder
+        for folder in self.get_folders(parent_id):
+            if folder.name == name:
+                return folder
+        return None
+
+    def walk_path(self, path: str, start: Tuple[list, tuple] = None, cache_only: bool = False):
+        """逐级解析路径
+        Args:
+            path: 以 / 开头的绝对路径，或相对 start 的路径
+            start: 相对路径的起点 (上级目录栈, (文件夹ID, 名称))，默认根目录
+            cache_only: 只使用已缓存的目录列表
+        Returns:
+            Optional[Tuple[list, tuple]]: (上级目录栈, (文件夹ID, 名称))，格式与 NavigationContext.folder_stack 相同
+        """
+        if path.startswith('/') or start is None:
+            stack = []
+            current = (self.root_folder_id, "根目录")
+        else:
+            stack = list(start[0])
+            current = start[1]
+
+        parts = [part for part in path.split('/') if part and part != '.']
+        # 允许以 /根目录 开头，与 pwd 的显示保持一致
+        if path.startswith('/') and parts and parts[0] == "根目录":
+            parts = parts[1:]
+
+        for part in parts:
+            if part == '..':
+                if stack:
+                    current = stack.pop()
+                continue
+            if cache_only:
+                folders = self.peek_cache(current[0])[0] or []
+                target = next((folder for folder in folders if folder.name == part), None)
+            else:
+                target = self.find_folder(current[0], part)
+            if not target:
+                return None
+            stack.append(current)
+            current = (target.folder_id, target.name)
+        return stack, current
+
+    def walk_files(self, folder_id: str, base_path: str, use_cache: bool = True) -> List[Tuple[str, FileInfo]]:
+        """并发遍历目录树下的所有文件
+        Args:
+            folder_id: 起始文件夹ID
+            base_path: 起始文件夹的显示路径
+            use_cache: 是否优先使用已缓存的列表
+        Returns:
+            List[Tuple[str, FileInfo]]: [(所在目录路径, 文件信息)]
+        """
+        def list_folder(fid, path):
+            return path, self.get_folders(fid, use_cache), self.get_files(fid, use_cache)
+
+        entries = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(list_folder, folder_id, base_path)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, folders, files = future.result()
+                    entries.extend((path, file) for file in files)
+                    for folder in folders:
+                        pending.add(executor.submit(list_folder, folder.folder_id, f"{path}/{folder.name}"))
+        return entries
+
+    def build_index(self, folder_id: str, base_path: str, refresh: bool = False) -> FileIndex:
+        """获取目录树的文件索引，已建立的索引会被复用
+        Args:
+            folder_id: 起始文件夹ID
+            base_path: 起始文件夹的显示路径
+            refresh: 是否忽略缓存重新遍历网盘
+        Returns:
+            FileIndex: 文件索引
+        """
+        with self._cache_lock:
+            index = self._indexes.get(folder_id)
+        if index is None or refresh:
+            index = FileIndex(self.walk_files(folder_id, base_path, use_cache=not refresh))
+            with self._cache_lock:
+                self._indexes[folder_id] = index
+        return index
+
     def save_cookies(self):
         """保存cookie到文件"""
-        cookie_dict = requests.utils.dict_from_cookiejar(self.session.cookies)
-        with open(self.cookie_file, 'w') as f:
-            json.dump(cookie_dict, f)
+        with self._cookie_lock:
+            cookie_dict = requests.utils.dict_from_cookiejar(self.session.cookies)
+            write_json_atomic(self.cookie_file, cookie_dict)
             
-    def load_cookies(self):
-        """从文件加载cookie"""
+    def load_cookies(self) -> bool:
+        """从文件加载cookie并验证
+        Returns:
+            bool: 已保存的登录状态是否有效，没有保存过时返回False
+        Raises:
+            RequestError: 网络错误，无法验证
+        """
+        cookie_dict = self._read_cookie_file()
+        if cookie_dict is None:
+            return False
+        # 逐个覆盖同名 cookie 而不先清空：其他线程发请求时不会拿到空的 cookie jar(那会被当成登录过期)
+        with self._cookie_lock:
+            self.session.cookies.update(requests.utils.cookiejar_from_dict(cookie_dict))
+        if not self.check_login():
+            return False
+        with self._cookie_lock:
+            self.session_generation += 1
+        return True
+        
+    def _read_cookie_file(self) -> Optional[Dict]:
+        """读取 cookie.json，不存在或无法解析时返回None"""
+        if not os.path.exists(self.cookie_file):
+            return None
         try:
-            if os.path.exists(self.cookie_file):
-                print("发现已保存的登录状态...")
-                with open(self.cookie_file, 'r') as f:
-                    cookie_dict = json.load(f)
-                    self.session.cookies = requests.utils.cookiejar_from_dict(cookie_dict)
-                print("正在验证登录状态...")
-                if self.check_login():
-                    print("✓ 使用已保存的登录状态")
-                    if self.user_info.get('username'):
-                        print(f"✓ 当前登录用户: {self.user_info['username']}")
-                    time.sleep(1)  # 暂停1秒
-                    os.system('cls' if os.name == 'nt' else 'clear')  # 清屏
-                    return True
-                else:
-                    print("✗ 登录状态已失效")
-                    return False
-        except Exception as e:
-            print(f"加载登录状态失败: {str(e)}")
-        return False
+            with open(self.cookie_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self._emit('warning', message=f"加载登录状态失败: {str(e)}")
+            return None
         
-    def check_login(self):
-        """检查cookie是否有效"""
+    def check_login(self) -> bool:
+        """检查cookie是否有效，有效时顺便获取用户名
+        Raises:
+            RequestError: 网络错误，无法验证
+        """
         try:
-            print("正在验证登录状态...")
             response = self.session.get(self.mydisk_url)
-            if "登录" not in response.text:
-                self.is_login = True
-                # 尝试获取用户信息
-                try:
-                    username_match = re.search(r'<a\s+href="[^"]*"\s+class="text"[^>]*>([^<]+)</a>', response.text)
-                    if username_match:
-                        self.user_info['username'] = username_match.group(1).strip()
-                except:
-                    pass
-                return True
-        except Exception as e:
-            print(f"验证登录状态失败: {str(e)}")
-        return False
+        except requests.RequestException as e:
+            raise RequestError(f"验证登录状态失败: {str(e)}")
+        if "登录" in response.text:
+            return False
+        self.is_login = True
+        # 尝试获取用户信息
+        username_match = re.search(r'<a\s+href="[^"]*"\s+class="text"[^>]*>([^<]+)</a>', response.text)
+        if username_match:
+            self.user_info['username'] = username_match.group(1).strip()
+        return True
         
-    def login(self, username, password):
+    def login(self, username, password, use_saved: bool = True) -> str:
         """登录蓝奏云
         Args:
             username: 用户名
             password: 密码
+            use_saved: 是否先尝试已保存的登录状态
         Returns:
-            bool: 是否登录成功
+            str: 'cookie' 表示使用了已保存的登录状态，'password' 表示用账号密码重新登录
+        Raises:
+            LoginError: 登录失败
+            RequestError: 网络错误
         """
+        self.set_credentials(username, password)
+        
         # 先尝试加载已保存的cookie
-        if self.load_cookies():
-            return True
+        if use_saved and self.load_cookies():
+            return 'cookie'
             
+        # 发送登录请求
+        data = {
+            "task": "3",
+            "uid": username,
+            "pwd": password,
+            "setSessionId": "",
+            "setSig": "",
+            "setScene": "",
+            "setTocen": "",
+            "formhash": "",
+        }
+        
+        headers = {
+            'Accept': 'application/json, text/javascript, */*',
+            'Accept-Language': 'zh-CN,zh;q=0.9',
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Origin': 'https://up.woozooo.com',
+            'Referer': 'https://up.woozooo.com/',
+            'User-Agent': self.session.headers['User-Agent']
+        }
+        
         try:
-            print("\n正在登录蓝奏云...")
-            print(f"账号: {username}")
-            print("密码: ********")
-            
-            # 发送登录请求
-            data = {
-                "task": "3",
-                "uid": username,
-                "pwd": password,
-                "setSessionId": "",
-                "setSig": "",
-                "setScene": "",
-                "setTocen": "",
-                "formhash": "",
-            }
-            
-            headers = {
-                'Accept': 'application/json, text/javascript, */*',
-                'Accept-Language': 'zh-CN,zh;q=0.9',
-                'Content-Type': 'application/x-www-form-urlencoded',
-                'Origin': 'https://up.woozooo.com',
-                'Referer': 'https://up.woozooo.com/',
-                'User-Agent': self.session.headers['User-Agent']
-            }
-            
-            # 发送登录请求
             response = self.session.post(
-                "https://up.woozooo.com/mlogin.php",
+                self.login_url,
                 data=data,
                 headers=headers,
                 allow_redirects=False
             )
+        except requests.RequestException as e:
+            raise RequestError(f"登录请求失败: {str(e)}")
+            
+        if response.status_code != 200:
+            raise LoginError(f"登录请求失败: HTTP {response.status_code}")
             
-            if response.status_code != 200:
-                print("✗ 登录请求失败")
-                sys.exit(1)  # 登录失败直接退出
+        try:
+            result = response.json()
+        except ValueError:
+            # 无法解析响应时，以能否打开网盘页面为准
+            if not self.check_login():
+                raise LoginError("登录失败，无法解析响应")
+        else:
+            if result.get('zt') != 1:
+                raise LoginError(f"登录失败: {result.get('info', '未知错误')}")
                 
+        self.save_cookies()
+        self.check_login()  # 获取用户名
+        self.is_login = True
+        with self._cookie_lock:
+            self.session_generation += 1
+        return 'password'
+        
+    def set_credentials(self, username, password):
+        """记录账号密码，登录过期后 renew_session 用它重新登录
+        只调用 load_cookies 恢复登录状态时需要先调用此方法，否则过期后无法自动重新登录
+        """
+        self._credentials = (username, password)
+        
+    def renew_session(self, generation: int):
+        """登录过期后恢复登录状态
+        多个线程同时发现过期时只有第一个线程真正处理，其余线程等待它完成后直接返回。
+        多个进程共用 cookie.json 时通过文件锁串行处理：拿到锁后如果 cookie.json 已被其他进程更新且有效，
+        直接加载它，否则才用账号密码重新登录并写回 cookie.json，避免大量进程同时请求 mlogin.php。
+        Args:
+            generation: 发出失败请求之前读取的 session_generation
+        Raises:
+            LoginError: 没有可用的账号密码或重新登录失败
+            RequestError: 网络错误
+        """
+        with self._login_lock:
+            if self.session_generation != generation:
+                return  # 等待期间已经有其他线程恢复了登录状态
+            with InterProcessLock(self.cookie_file + '.lock'):
+                source = None
+                saved = self._read_cookie_file()
+                with self._cookie_lock:
+                    current = requests.utils.dict_from_cookiejar(self.session.cookies)
+                # 文件中有与当前不同的 cookie，说明其他进程已经刷新过登录状态
+                refreshed = saved and any(current.get(name) != value for name, value in saved.items())
+                if refreshed and self.load_cookies():
+                    source = 'cookie'
+                else:
+                    if not self._credentials:
+                        raise LoginError("登录已过期，请重新登录")
+                    self.login(*self._credentials, use_saved=False)
+                    source = 'password'
+        self._emit('session_renewed', source=source)
+            
+    def _load_share_cache(self) -> Dict[str, Dict]:
+        """加载分享链接缓存，调用方需持有_cache_lock"""
+        if self._share_cache is None:
+            self._share_cache = {}
             try:
-                result = response.json()
-                if result.get('zt') == 1:
-                    print("✓ 登录成功!")
-                    self.save_cookies()
-                    self.load_cookies()  # 立即加载新保存的cookie
-                    self.is_login = True
-                    time.sleep(1)  # 暂停1秒
-                    os.system('cls' if os.name == 'nt' else 'clear')  # 清屏
-                    return True
+                if os.path.exists(self.share_cache_file):
+                    with open(self.share_cache_file, 'r') as f:
+                        self._share_cache = json.load(f)
+            except Exception as e:
+                self._emit('warning', message=f"读取分享链接缓存失败: {str(e)}")
+        return self._share_cache
+        
+    def save_share_cache(self):
+        """保存分享链接缓存到文件"""
+        with self._cache_lock:
+            cache = dict(self._load_share_cache())
+        write_json_atomic(self.share_cache_file, cache, ensure_ascii=False)
+            
+    def get_share_info(self, file_id: str, use_cache: bool = True) -> Dict:
+        """获取文件的分享信息
+        Args:
+            file_id: 文件ID
+            use_cache: 是否优先使用缓存的分享链接
+        Returns:
+            Dict: {'file_id', 'url', 'pwd'}
+        Raises:
+            RequestError: 获取失败
+        """
+        if use_cache:
+            with self._cache_lock:
+                cached = self._load_share_cache().get(file_id)
+            if cached:
+                return cached
+                
+        result = self._post(
+            self.doupload_url,
+            data={
+                "task": "22",
+                "file_id": file_id
+            }
+        )
+        info = result.get("info")
+        if not isinstance(info, dict) or not info.get("is_newd"):
+            raise RequestError("服务器没有返回分享链接")
+        domain = info["is_newd"]
+        # is_newd 是分享域名，f_id 是文件的分享码
+        share_code = info.get("f_id")
+        share_info = {
+            'file_id': file_id,
+            'url': f"{domain.rstrip('/')}/{share_code}" if share_code else domain,
+            'pwd': info.get("pwd", "") if info.get("onof") == "1" else ""
+        }
+        with self._cache_lock:
+            self._load_share_cache()[file_id] = share_info
+        return share_info
+            
+    def get_share_infos(self, file_ids: List[str], use_cache: bool = True) -> Dict[str, Optional[Dict]]:
+        """并发获取多个文件的分享信息，结果会写入分享链接缓存
+        Args:
+            file_ids: 文件ID列表
+            use_cache: 是否优先使用缓存的分享链接
+        Returns:
+            Dict[str, Optional[Dict]]: 文件ID -> 分享信息，失败为None
+        """
+        def fetch(file_id):
+            try:
+                return self.get_share_info(file_id, use_cache)
+            except LanZouError:
+                return None
+                
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {file_id: executor.submit(fetch, file_id) for file_id in file_ids}
+            results = {file_id: future.result() for file_id, future in futures.items()}
+        self.save_share_cache()
+        return results
+        
+    def _upload_form(self, file_name: str, folder_id: str) -> Dict[str, str]:
+        """html5up.php 上传表单中除文件以外的字段"""
+        return {
+            "task": "1",
+            "vie": "2",
+            "ve": "2",
+            "id": "WU_FILE_0",
+            "name": file_name,
+            "folder_id_bb_n": folder_id
+        }
+        
+    def _upload_result(self, status_code: int, content: bytes, generation: int) -> str:
+        """解析 html5up.php 的响应
+        Args:
+            generation: 发送请求之前读取的 session_generation，登录过期时用于重新登录
+        Returns:
+            str: 文件ID
+        Raises:
+            TransportError: 服务器错误、响应无法解析或登录已过期(已重新登录)，可以重试
+            ServerRejectedError: 服务器拒绝了该文件，或登录过期后无法重新登录
+        """
+        if status_code >= 500:
+            raise TransportError(f"服务器错误: HTTP {status_code}")
+        if status_code != 200:
+            raise ServerRejectedError(f"上传失败: HTTP {status_code}")
+            
+        # 解析响应
+        try:
+            result = json.loads(content)
+        except ValueError:
+            raise TransportError("解析响应失败，服务器返回的不是JSON")
+        if result.get("zt") == 1:
+            text = result.get("text") or [{}]
+            file_id = text[0].get("id") if isinstance(text, list) else None
+            if file_id:
+                return file_id
+        if session_expired(result):
+            # 内容流已经发送完，不能在这里重发；重新登录后交给 with_retry 重新传输
+            try:
+                self.renew_session(generation)
+            except LanZouError as e:
+                raise ServerRejectedError(f"登录已过期: {str(e)}")
+            raise TransportError("登录已过期，已重新登录")
+        raise ServerRejectedError(f"上传失败: {result.get('info', '未知错误')}")
+        
+    def _begin_transfer(self, file_name: str, size: Optional[int], folder_id: str):
+        """发出 transfer_start 事件
+        Returns:
+            Tuple: (传输编号, 进度回调)，没有设置事件回调时进度回调为None，传输过程不做任何统计
+        """
+        if not self.on_event:
+            return None, None
+        transfer = next(self._transfer_ids)
+        self._emit('transfer_start', transfer=transfer, name=file_name, size=size, folder_id=folder_id)
+        return transfer, lambda amount: self._emit('transfer_progress', transfer=transfer, bytes=amount)
+        
+    def transfer_stream(self, file_name: str, chunks, size: int = None, folder_id: str = None) -> str:
+        """把内容流上传为网盘文件，文件内容边读边发送，不会整体读入内存
+        Args:
+            file_name: 网盘中的文件名
+            chunks: 文件内容的字节块迭代器
+            size: 内容总长度，未知时为None(使用分块传输编码)
+            folder_id: 目标文件夹ID，默认根目录
+        Returns:
+            str: 文件ID
+        Raises:
+            LoginError: 未登录
+            TransportError: 网络或传输错误，可以重试
+            ServerRejectedError: 服务器拒绝了该文件
+        """
+        if folder_id is None:
+            folder_id = self.root_folder_id
+            
+        if not self.is_login:
+            raise LoginError("请先登录")
+            
+        transfer, progress = self._begin_transfer(file_name, size, folder_id)
+        file_id = None
+        error = None
+        try:
+            try:
+                if self.rate_limiter:
+                    chunks = self.rate_limiter.throttle(chunks)
+                body = MultipartStream(self._upload_form(file_name, folder_id), "upload_file", file_name,
+                                       chunks, size, callback=progress)
+                generation = self.session_generation
+                response = self.session.post(
+                    f"{self.base_url}/html5up.php",
+                    data=body,
+                    headers={'Content-Type': body.content_type}
+                )
+            except Exception as e:
+                raise TransportError(f"上传过程出错: {str(e)}")
+                
+            self.invalidate_cache(folder_id)
+            file_id = self._upload_result(response.status_code, response.content, generation)
+            return file_id
+        except UploadError as e:
+            error = e
+            raise
+        finally:
+            if transfer is not None:
+                self._emit('transfer_end', transfer=transfer, file_id=file_id, error=error)
+        
+    def transfer_sendfile(self, file_name: str, f, size: int, folder_id: str = None) -> str:
+        """用 sendfile 把已打开的文件上传为网盘文件，文件内容由内核直接发送，不复制到 Python 中
+        请求头(User-Agent、Cookie 等)与 session 发出的请求相同，但不经过 requests，因此不使用代理设置。
+        Args:
+            file_name: 网盘中的文件名
+            f: 以二进制模式打开的文件
+            size: 文件大小
+            folder_id: 目标文件夹ID，默认根目录
+        Returns:
+            str: 文件ID
+        Raises:
+            LoginError: 未登录
+            TransportError: 网络或传输错误，可以重试
+            ServerRejectedError: 服务器拒绝了该文件
+        """
+        if folder_id is None:
+            folder_id = self.root_folder_id
+            
+        if not self.is_login:
+            raise LoginError("请先登录")
+            
+        url = f"{self.base_url}/html5up.php"
+        body = MultipartStream(self._upload_form(file_name, folder_id), "upload_file", file_name, None, size)
+        # 借助 requests 合并 session 的默认请求头和对应域名的 Cookie
+        generation = self.session_generation
+        prepared = self.session.prepare_request(
+            requests.Request('POST', url, headers={'Content-Type': body.content_type}))
+        transfer, progress = self._begin_transfer(file_name, size, folder_id)
+        file_id = None
+        error = None
+        try:
+            try:
+                status_code, content = sendfile_post(url, dict(prepared.headers), body, f, size,
+                                                     callback=progress, rate_limiter=self.rate_limiter)
+            except Exception as e:
+                raise TransportError(f"上传过程出错: {str(e)}")
+                
+            self.invalidate_cache(folder_id)
+            file_id = self._upload_result(status_code, content, generation)
+            return file_id
+        except UploadError as e:
+            error = e
+            raise
+        finally:
+            if transfer is not None:
+                self._emit('transfer_end', transfer=transfer, file_id=file_id, error=error)
+        
+    def transfer_file(self, file_path, folder_id=None) -> str:
+        """传输文件到网盘(不获取分享链接)
+        Args:
+            file_path: 本地文件路径
+            folder_id: 目标文件夹ID，默认根目录
+        Returns:
+            str: 文件ID
+        Raises:
+            UploadError: 传输失败或被服务器拒绝
+        """
+        if folder_id is None:
+            folder_id = self.root_folder_id
+            
+        file_name = os.path.basename(file_path)
+        try:
+            file_size = os.path.getsize(file_path)
+            f = open(file_path, "rb")
+        except OSError as e:
+            raise LocalFileError(f"无法读取文件: {str(e)}")
+            
+        with f:
+            # TLS 连接上 sendfile 只会退回到 8K 的缓冲读写，比 requests 更慢，HTTPS 地址始终走 requests
+            if self.upload_transport == 'sendfile' and urlsplit(self.base_url).scheme == 'http':
+                return self.transfer_sendfile(file_name, f, file_size, folder_id)
+            return self.transfer_stream(file_name, iter_file_chunks(f), file_size, folder_id)
+            
+    def fetch_share_link(self, file_id: str) -> str:
+        """获取刚上传文件的分享链接
+        Raises:
+            MetadataError: 获取失败，文件本身已经上传成功
+        """
+        try:
+            return self.get_share_info(file_id)['url']
+        except LanZouError as e:
+            raise MetadataError(f"无法获取分享链接: {str(e)}", file_id)
+        
+    def with_retry(self, action, attempts: int = UPLOAD_RETRIES, description: str = "上传"):
+        """按指数退避(带随机抖动)重试 action，只重试可重试的 UploadError，每次重试前发出 retry 事件
+        Args:
+            action: 无参数的可调用对象
+            attempts: 最多尝试次数
+            description: 事件中使用的操作名称
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                return action()
+            except UploadError as e:
+                if not e.retryable or attempt >= attempts:
+                    raise
+                delay = backoff_delay(attempt)
+                self._emit('retry', description=description, attempt=attempt, delay=delay, error=e)
+                time.sleep(delay)
+                
+    def upload_with_retry(self, file_path, folder_id=None, attempts: int = UPLOAD_RETRIES) -> str:
+        """上传文件并获取分享链接，按阶段重试
+        传输失败时重新传输；文件已上传但获取分享链接失败时，只用已有的文件ID重新获取链接，不会重复上传
+        Returns:
+            str: 分享链接
+        Raises:
+            LoginError: 未登录
+            UploadError: 重试后仍然失败，file_id 不为空表示文件已经上传成功
+        """
+        if not self.is_login:
+            raise LoginError("请先登录")
+        file_id = self.with_retry(lambda: self.transfer_file(file_path, folder_id), attempts, "上传")
+        return self.with_retry(lambda: self.fetch_share_link(file_id), attempts, "获取分享链接")
+        
+    def upload_file(self, file_path, folder_id=None) -> str:
+        """上传文件并获取分享链接，只尝试一次
+        失败时抛出异常，不再打印错误并返回 None；需要重试时使用 upload_with_retry
+        Args:
+            file_path: 本地文件路径
+            folder_id: 目标文件夹ID，默认根目录
+        Returns:
+            str: 分享链接
+        Raises:
+            LoginError: 未登录
+            UploadError: 上传失败，按阶段为 LocalFileError、TransportError、ServerRejectedError 或
+                MetadataError(文件已上传，file_id 为文件ID)
+        """
+        return self.upload_with_retry(file_path, folder_id, attempts=1)
+            
+    def upload_stream(self, stream, file_name: str, folder_id: str = None,
+                      part_size: int = MAX_UPLOAD_SIZE) -> List[Dict]:
+        """上传数据流(如标准输入、管道)，不需要先写入临时文件
+        数据按 part_size 读入有界缓冲区后上传：长度已知，可以发送 Content-Length，失败时也能直接从缓冲区重试。
+        数据超过 part_size 时自动分卷，依次命名为 名称.part001.扩展名、名称.part002.扩展名 ...
+        Args:
+            stream: 二进制数据流，需支持 read()
+            file_name: 网盘中的文件名
+            folder_id: 目标文件夹ID，默认根目录
+            part_size: 单个分卷的最大字节数
+        Returns:
+            List[Dict]: 每个分卷的结果 {'name', 'size', 'file_id', 'url'}
+        Raises:
+            LoginError: 未登录
+            UploadError: 数据流为空，或某个分卷重试后仍然失败；之前已上传的分卷保留在网盘中，
+                其结果列表(格式同返回值)放在异常的 parts 属性中
+        """
+        if not self.is_login:
+            raise LoginError("请先登录")
+        results = []
+        buffer = read_up_to(stream, part_size)
+        length = len(buffer)
+        if not length:
+            raise LocalFileError("数据流为空")
+        index = 0
+        try:
+            while True:
+                index += 1
+                # 缓冲区已满时多读一个字节，判断后面是否还有数据
+                following = stream.read(1) if length == part_size else b""
+                if index == 1 and not following:
+                    name = file_name
                 else:
-                    print(f"✗ 登录失败: {result.get('info', '未知错误')}")
-                    sys.exit(1)  # 登录失败直接退出
-            except:
-                if self.check_login():
-                    print("✓ 登录成功!")
-                    self.save_cookies()
-                    self.load_cookies()  # 立即加载新保存的cookie
-                    time.sleep(1)  # 暂停1秒
-                    os.system('cls' if os.name == 'nt' else 'clear')  # 清屏
+                    name = part_name(file_name, index)
+                    
+                file_id = self.with_retry(
+                    lambda: self.transfer_stream(name, iter_buffer_chunks(buffer, length), length, folder_id))
+                url = self.with_retry(lambda: self.fetch_share_link(file_id), description="获取分享链接")
+                results.append({'name': name, 'size': length, 'file_id': file_id, 'url': url})
+                
+                if not following:
+                    break
+                # 后续分卷复用同一个缓冲区原地读取，内存中始终只有一个分卷；最后一个分卷较短时只发送前 length 字节
+                buffer[0:1] = following
+                length = read_into(stream, buffer, 1)
+        except UploadError as e:
+            e.parts = results
+            raise
+        finally:
+            self.save_share_cache()
+        return results
+        
+    def upload_batch(self, jobs: List[Tuple[str, str]], queue_size: int = 2,
+                     workers: int = 1, small_first: bool = False) -> List[Dict]:
+        """流水线批量上传
+        上传分为 准备 -> 传输 -> 上传后处理(获取分享链接) 三个阶段，阶段之间用有界队列连接。
+        第N个文件获取分享链接时，第N+1个文件已经在传输，上传连接不会空等后续请求。
+        Args:
+            jobs: [(本地文件路径, 目标文件夹ID)]
+            queue_size: 阶段间队列的最大长度
+            workers: 同时进行的传输数，多个传输共享 rate_limiter 的带宽
+            small_first: 是否优先传输小文件，在总带宽不变时单位时间内完成更多文件
+        Returns:
+            List[Dict]: 与jobs顺序一致的结果 {'path', 'folder_id', 'size', 'file_id', 'url', 'error'}
+        Raises:
+            LoginError: 未登录，在开始任何传输之前检查
+        """
+        if not self.is_login:
+            raise LoginError("请先登录")
+        results = [
+            {'path': path, 'folder_id': folder_id, 'size': 0, 'file_id': None, 'url': None, 'error': None}
+            for path, folder_id in jobs
+        ]
+        transfer_queue = queue.Queue(maxsize=queue_size)
+        metadata_queue = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()  # 中断或意外错误时通知各阶段退出
+        
+        def put(q, item) -> bool:
+            """放入有界队列，停止时放弃并返回False，不会一直阻塞在已无人消费的队列上"""
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
                     return True
-                print("✗ 登录失败，无法解析响应")
-                sys.exit(1)  # 登录失败直接退出
+                except queue.Full:
+                    pass
+            return False
+            
+        def get(q):
+            """从队列取出一项，停止时返回None"""
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return None
+        
+        def prepare():
+            try:
+                ready = []
+                for result in results:
+                    path = result['path']
+                    if not os.path.isfile(path):
+                        result['error'] = "文件不存在"
+                        continue
+                    result['size'] = os.path.getsize(path)
+                    if result['size'] > MAX_UPLOAD_SIZE:
+                        result['error'] = f"文件超过大小限制({MAX_UPLOAD_SIZE // 1024 // 1024}MB)"
+                        continue
+                    if small_first:
+                        ready.append(result)
+                    elif not put(transfer_queue, result):
+                        return
+                # 小文件优先时需要先拿到全部文件大小再排序
+                for result in sorted(ready, key=lambda item: item['size']):
+                    if not put(transfer_queue, result):
+                        return
+            finally:
+                put(transfer_queue, None)
                 
-        except Exception as e:
-            print(f"✗ 登录过程出错: {str(e)}")
-            sys.exit(1)  # 登录失败直接退出
+        def transfer():
+            while True:
+                result = get(transfer_queue)
+                if result is None:
+                    # 把结束标记传给其他传输线程
+                    put(transfer_queue, None)
+                    break
+                try:
+                    result['file_id'] = self.with_retry(
+                        lambda: self.transfer_file(result['path'], result['folder_id']))
+                except UploadError as e:
+                    result['error'] = f"{e.phase_name}失败: {str(e)}"
+                    continue
+                except Exception as e:
+                    # 单个文件的意外错误不能让整条流水线停下
+                    result['error'] = f"上传失败: {str(e)}"
+                    continue
+                if not put(metadata_queue, result):
+                    break
+                    
+        def post_upload():
+            while True:
+                result = get(metadata_queue)
+                if result is None:
+                    break
+                file_id = result['file_id']
+                try:
+                    result['url'] = self.with_retry(lambda: self.fetch_share_link(file_id),
+                                                    description="获取分享链接")
+                except Exception as e:
+                    phase = e.phase_name if isinstance(e, UploadError) else "获取分享链接"
+                    result['error'] = f"{phase}失败: {str(e)} (文件已上传，ID: {file_id})"
+                    
+        stages = [threading.Thread(target=prepare, daemon=True),
+                  threading.Thread(target=post_upload, daemon=True)]
+        for stage in stages:
+            stage.start()
             
-    def upload_file(self, file_path, folder_id=None):
-        """上传文件
+        completed = False
+        try:
+            if workers <= 1:
+                # 单个传输时在当前线程执行，进度条输出不会与其他阶段交错
+                transfer()
+            else:
+                transfers = [threading.Thread(target=transfer, daemon=True) for _ in range(workers)]
+                for worker in transfers:
+                    worker.start()
+                for worker in transfers:
+                    worker.join()
+            completed = True
+        finally:
+            if completed:
+                metadata_queue.put(None)
+                for stage in stages:
+                    stage.join()
+            else:
+                # Ctrl+C 或意外错误: 通知各阶段停止并清空队列，阻塞在 put 上的阶段随即退出
+                stop.set()
+                for q in (transfer_queue, metadata_queue):
+                    while True:
+                        try:
+                            q.get_nowait()
+                        except queue.Empty:
+                            break
+                for stage in stages:
+                    stage.join(timeout=1.0)  # 正在获取分享链接的阶段可能还在重试等待，不再等它
+            self.save_share_cache()
+        return results
+        
+    def upload_packs(self, members: List[Tuple[str, str, int]], folder_id: str = None,
+                     max_size: int = 90 * 1024 * 1024, fmt: str = 'zip') -> List[Dict]:
+        """把大量小文件打包成归档后上传
+        归档在后台线程中生成并直接流式写入上传请求，不产生临时文件。
+        上传完成后把 原始路径 -> (归档, 偏移) 的对应关系写入本地 manifest，便于定位单个文件。
         Args:
-            file_path: 本地文件路径
-            folder_id: 目标文件夹ID，默认根目录
+            members: [(本地路径, 归档内名称, 文件大小)]
+            folder_id: 归档上传到的文件夹ID，默认根目录
+            max_size: 单个归档的大小上限
+            fmt: 归档格式，zip 或 tar
         Returns:
-            str: 成功返回分享链接，失败返回None
+            List[Dict]: 每个归档的结果 {'archive', 'size', 'count', 'file_id', 'url', 'error'}
+        Raises:
+            LoginError: 未登录，在开始任何传输之前检查
         """
+        if not self.is_login:
+            raise LoginError("请先登录")
         if folder_id is None:
             folder_id = self.root_folder_id
             
-        if not self.is_login:
-            print("✗ 请先登录")
-            return None
-            
-        try:
-            file_name = os.path.basename(file_path)
-            print(f"\n[上传文件]")
-            print(f"文件名称: {file_name}")
-            print(f"文件大小: {os.path.getsize(file_path) / 1024 / 1024:.2f}MB")
-            print(f"目标目录: {'根目录' if folder_id == self.root_folder_id else folder_id}")
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        results = []
+        manifest = []
+        for i, pack in enumerate(plan_packs(members, max_size, fmt), 1):
+            archive = f"pack_{stamp}_{i:03d}.{fmt}"
+            size, offsets = pack_layout(pack, fmt)
+            self._emit('pack_start', archive=archive, count=len(pack), size=size)
             
-            # 上传文件
-            file_size = os.path.getsize(file_path)
-            with open(file_path, "rb") as f:
-                with tqdm(total=file_size, unit='B', unit_scale=True, desc="上传进度", ncols=100) as pbar:
-                    files = {
-                        "upload_file": (file_name, f, "application/octet-stream")
-                    }
-                    data = {
-                        "task": "1",
-                        "vie": "2",
-                        "ve": "2",
-                        "id": "WU_FILE_0",
-                        "name": file_name,
-                        "folder_id_bb_n": folder_id
-                    }
-                    response = self.session.post(
-                        f"{self.base_url}/html5up.php",
-                        files=files,
-                        data=data
-                    )
-                    pbar.update(file_size)
-                    
-            if response.status_code != 200:
-                print(f"✗ 上传失败: HTTP {response.status_code}")
-                return None
+            result = {'archive': archive, 'size': size, 'count': len(pack), 'file_id': None, 'url': None, 'error': None}
+            results.append(result)
+            try:
+                # 每次重试都重新生成归档流
+                file_id = self.with_retry(
+                    lambda: self.transfer_stream(archive, stream_pack(pack, fmt), size, folder_id))
+            except UploadError as e:
+                result['error'] = f"{e.phase_name}失败: {str(e)}"
+                continue
                 
-            # 解析响应
+            result['file_id'] = file_id
             try:
-                result = response.json()
-                if result.get("zt") == 1:
-                    file_info = result.get("text", [{}])[0]
-                    file_id = file_info.get("id")
-                    if file_id:
-                        print("✓ 文件上传成功，正在获取分享链接...")
-                        # 获取分享链接
-                        share_response = self.session.post(
-                            f"{self.base_url}/doupload.php",
-                            data={
-                                "task": "22",
-                                "file_id": file_id
-                            }
-                        )
-                        share_result = share_response.json()
-                        if share_result.get("zt") == 1:
-                            share_info = share_result.get("info", {})
-                            share_url = share_info.get("is_newd")
-                            if share_url:
-                                print("✓ 分享链接获取成功")
-                                return share_url
-                print("✗ 无法获取分享链接")
-                return None
-            except Exception as e:
-                print(f"✗ 解析响应失败: {str(e)}")
-                return None
+                result['url'] = self.with_retry(lambda: self.fetch_share_link(file_id), description="获取分享链接")
+            except UploadError as e:
+                self._emit('warning', message=f"{archive}: {str(e)}")
+            for (path, arcname, member_size), offset in zip(pack, offsets):
+                manifest.append({
+                    'path': os.path.abspath(path),
+                    'archive': archive,
+                    'member': arcname.replace(os.sep, '/'),
+                    'offset': offset,
+                    'size': member_size,
+                    'folder_id': folder_id,
+                    'file_id': file_id,
+                    'url': result['url']
+                })
                 
+        if manifest:
+            self.save_pack_manifest(manifest)
+        self.save_share_cache()
+        return results
+        
+    def save_pack_manifest(self, entries: List[Dict]):
+        """把打包记录合并写入 manifest 文件，同一原始路径只保留最新的记录"""
+        existing = []
+        try:
+            if os.path.exists(self.pack_manifest_file):
+                with open(self.pack_manifest_file, 'r', encoding='utf-8') as f:
+                    existing = json.load(f)
         except Exception as e:
-            print(f"✗ 上传过程出错: {str(e)}")
+            self._emit('warning', message=f"读取打包清单失败: {str(e)}")
+        paths = {entry['path'] for entry in entries}
+        merged = [entry for entry in existing if entry.get('path') not in paths] + entries
+        write_json_atomic(self.pack_manifest_file, merged, ensure_ascii=False, indent=2)
+            
+    def make_dirs(self, parent_id: str, rel_path: str) -> str:
+        """确保多级子目录存在，不存在则逐级创建
+        Args:
+            parent_id: 起始文件夹ID
+            rel_path: 相对路径，如 "a/b/c"
+        Returns:
+            str: 最后一级文件夹ID
+        Raises:
+            RequestError: 获取或创建文件夹失败
+        """
+        folder_id = parent_id
+        for name in [part for part in rel_path.replace('\\', '/').split('/') if part and part != '.']:
+            # 缓存中没有时 find_folder 会重新获取，避免重复创建缓存之后在别处新建的文件夹
+            target = self.find_folder(folder_id, name)
+            if not target:
+                target = self.create_folder(name, folder_id)
+            folder_id = target.folder_id
+        return folder_id
+
+class NavigationContext:
+    """一个用户的目录导航状态: 当前目录和上级目录栈
+    LanZouWeb 本身不保存当前目录，所有操作都显式传入文件夹ID，多个线程可以共用同一个已登录的客户端，
+    每个用户(或线程)各自持有一个 NavigationContext。
+    """
+    def __init__(self, client: LanZouWeb):
+        self.client = client
+        self.current_folder_id = client.root_folder_id  # 当前目录ID
+        self.current_folder_name = "根目录"  # 当前目录名称
+        self.folder_stack = []  # 目录栈，用于返回上级目录
+        
+    def get_current_path(self) -> str:
+        """获取当前完整路径"""
+        return format_remote_path(self.folder_stack, (self.current_folder_id, self.current_folder_name))
+        
+    def resolve_path(self, path: str, cache_only: bool = False) -> Optional[Tuple[str, str]]:
+        """解析网盘路径
+        Args:
+            path: 绝对路径(以 / 开头)或相对当前目录的路径，支持 . 和 ..
+            cache_only: 只使用已缓存的目录列表，不发起网络请求
+        Returns:
+            Optional[Tuple[str, str]]: (文件夹ID, 完整路径)，目录不存在返回None
+        """
+        resolved = self.client.walk_path(path, self._start(), cache_only)
+        if not resolved:
             return None
+        stack, current = resolved
+        return current[0], format_remote_path(stack, current)
+        
+    def _start(self) -> Tuple[list, tuple]:
+        return self.folder_stack, (self.current_folder_id, self.current_folder_name)
+        
+    def cd(self, folder_name: str) -> str:
+        """进入指定目录
+        Args:
+            folder_name: 目录名称，可以是 ".." 返回上级目录，或包含 / 的多级路径
+        Returns:
+            str: 进入后的完整路径
+        Raises:
+            PathError: 目录不存在或已经在根目录
+        """
+        if not self.client.is_login:
+            raise LoginError("请先登录")
+            
+        # 多级路径，如 cd a/b、cd ../c、cd /
+        if '/' in folder_name:
+            resolved = self.client.walk_path(folder_name, self._start())
+            if not resolved:
+                raise PathError(f"目录不存在: {folder_name}")
+            self.folder_stack, (self.current_folder_id, self.current_folder_name) = resolved
+            return self.get_current_path()
+            
+        # 返回上级目录
+        if folder_name == "..":
+            if not self.folder_stack:
+                raise PathError("已经在根目录")
+            self.current_folder_id, self.current_folder_name = self.folder_stack.pop()
+            return self.get_current_path()
+            
+        # 查找目标文件夹
+        target_folder = self.client.find_folder(self.current_folder_id, folder_name)
+        if not target_folder:
+            raise PathError(f"目录不存在: {folder_name}")
+            
+        # 保存当前目录到栈中
+        self.folder_stack.append((self.current_folder_id, self.current_folder_name))
+        
+        # 更新当前目录
+        self.current_folder_id = target_folder.folder_id
+        self.current_folder_name = target_folder.name
+        return self.get_current_path()
+            
+    def pwd(self) -> Tuple[str, str]:
+        """当前目录
+        Returns:
+            Tuple[str, str]: (完整路径, 目录ID)
+        """
+        return self.get_current_path(), self.current_folder_id
 
 def check_file_size(file_path):
     """检查文件大小"""
     file_size = os.path.getsize(file_path)
     file_size_mb = file_size / (1024 * 1024)
-    if file_size_mb > 100:
+    if file_size > MAX_UPLOAD_SIZE:
         print(f"✗ 文件大小 {file_size_mb:.2f}MB 超过免费用户限制(100MB)")
         return False
     return True
 
+class ConsoleReporter:
+    """把 LanZouWeb 的事件输出到终端，传输时显示进度条"""
+    def __init__(self, root_folder_id: str = "-1"):
+        self.root_folder_id = root_folder_id
+        self._bars = {}  # 传输编号 -> 进度条
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, info: Dict):
+        if event == 'transfer_start':
+            folder_id = info['folder_id']
+            print("\n[上传文件]")
+            print(f"文件名称: {info['name']}")
+            if info['size'] is not None:
+                print(f"文件大小: {info['size'] / 1024 / 1024:.2f}MB")
+            print(f"目标目录: {'根目录' if folder_id == self.root_folder_id else folder_id}")
+            bar = tqdm(total=info['size'], unit='B', unit_scale=True, desc="上传进度", ncols=100)
+            with self._lock:
+                self._bars[info['transfer']] = bar
+        elif event == 'transfer_progress':
+            with self._lock:
+                bar = self._bars.get(info['transfer'])
+            if bar:
+                bar.update(info['bytes'])
+        elif event == 'transfer_end':
+            with self._lock:
+                bar = self._bars.pop(info['transfer'], None)
+            if bar:
+                bar.close()
+            if not info['error']:
+                print("✓ 文件上传成功")
+        elif event == 'retry':
+            print(f"{YELLOW}[{info['description']}第{info['attempt']}次失败: {str(info['error'])}] "
+                  f"等待{info['delay']:.1f}秒后重试...{RESET}")
+        elif event == 'folder_created':
+            folder = info['folder']
+            print(f"{GREEN}✓ 已创建文件夹: {folder.name} (ID: {folder.folder_id}){RESET}")
+        elif event == 'pack_start':
+            print("\n[上传归档]")
+            print(f"归档名称: {info['archive']}")
+            print(f"包含文件: {info['count']} 个")
+        elif event == 'warning':
+            print(f"{YELLOW}! {info['message']}{RESET}")
+        elif event == 'session_renewed':
+            how = "已加载其他进程刷新的登录状态" if info['source'] == 'cookie' else "已重新登录"
+            print(f"{CYAN}登录已过期，{how}{RESET}")
+
+def make_client() -> Optional['LanZouWeb']:
+    """创建输出到终端的客户端，配置有误时输出提示并返回None"""
+    try:
+        return LanZouWeb(on_event=ConsoleReporter())
+    except ConfigError as e:
+        print(f"{RED}✗ {str(e)}{RESET}")
+        if 'uid' in str(e):
+            print(f"{CYAN}uid可以从浏览器F12开发者工具中获取，位于网络请求的URL参数中{RESET}")
+        return None
+
+def cli_login(client, username, password) -> bool:
+    """登录并输出过程，成功后清屏"""
+    client.set_credentials(username, password)  # 使用已保存的登录状态时也要记录，过期后自动重新登录
+    try:
+        if os.path.exists(client.cookie_file):
+            print("发现已保存的登录状态...")
+            print("正在验证登录状态...")
+            if client.load_cookies():
+                print("✓ 使用已保存的登录状态")
+            else:
+                print("✗ 登录状态已失效")
+        if not client.is_login:
+            print("\n正在登录蓝奏云...")
+            print(f"账号: {username}")
+            print("密码: ********")
+            client.login(username, password, use_saved=False)
+            print("✓ 登录成功!")
+    except LanZouError as e:
+        print(f"✗ {str(e)}")
+        return False
+        
+    if client.user_info.get('username'):
+        print(f"✓ 当前登录用户: {client.user_info['username']}")
+    time.sleep(1)  # 暂停1秒
+    os.system('cls' if os.name == 'nt' else 'clear')  # 清屏
+    return True
+
+def print_dir(nav, folder_id: str = None):
+    """ls 命令: 列出目录内容"""
+    folders, files = nav.client.list_dir(folder_id or nav.current_folder_id)
+    print(f"\n{BLUE}=== 目录内容: {nav.get_current_path()} ==={RESET}")
+    if folders:
+        print("\n[文件夹]")
+        for folder in folders:
+            print(f"├─ {folder}")
+    if files:
+        print("\n[文件]")
+        for file in files:
+            print(f"├─ {file}")
+    if not folders and not files:
+        print("\n目录为空")
+
+def cmd_pwd(nav):
+    """pwd 命令: 显示当前目录路径"""
+    path, folder_id = nav.pwd()
+    print(f"\n当前位置: {path}")
+    print(f"目录ID: {folder_id}")
+
+def cmd_cd(nav, args) -> bool:
+    """cd 命令: 进入目录，支持 .. 和多级路径"""
+    if not args:
+        print(f"{RED}✗ 请指定目录名{RESET}")
+        return False
+    try:
+        path = nav.cd(args[0])
+    except PathError as e:
+        print(f"{RED}✗ {str(e)}{RESET}")
+        return False
+    print(f"✓ 进入目录: {path}")
+    print(f"✓ 目录ID: {nav.current_folder_id}")
+    return True
+
+def cmd_mkdir(nav, args):
+    """mkdir 命令: 在当前目录下创建目录"""
+    client = nav.client
+    if not args:
+        print(f"{RED}✗ 请指定目录名{RESET}")
+        return
+    client.create_folder(args[0], nav.current_folder_id)
+
+def cmd_rmdir(nav, args):
+    """rmdir 命令: 删除当前目录下的目录"""
+    client = nav.client
+    if not args:
+        print(f"{RED}✗ 请指定要删除的目录名{RESET}")
+        return
+    folder_name = args[0]
+    target_folder = None
+    for folder in client.get_folders(nav.current_folder_id):
+        if folder.name == folder_name:
+            target_folder = folder
+            break
+    if not target_folder:
+        print(f"{RED}✗ 目录不存在: {folder_name}{RESET}")
+        return
+    client.delete_folder(target_folder.folder_id)
+    print(f"{GREEN}✓ 删除成功: {folder_name}{RESET}")
+
+def cmd_rm(nav, args):
+    """rm 命令: 删除当前目录下的文件"""
+    client = nav.client
+    if not args:
+        print(f"{RED}✗ 请指定要删除的文件名{RESET}")
+        return
+    file_name = args[0]
+    target_file = None
+    for file in client.get_files(nav.current_folder_id):
+        if file.name == file_name:
+            target_file = file
+            break
+    if not target_file:
+        print(f"{RED}✗ 文件不存在: {file_name}{RESET}")
+        return
+    client.delete_file(target_file.id)
+    print(f"{GREEN}✓ 删除成功: {file_name}{RESET}")
+
+def cmd_upload(nav, args):
+    """upload 命令: 单个文件直接上传，多个路径、目录或标准输入交给 cmd_upload_batch"""
+    client = nav.client
+    if not args:
+        print(f"{RED}✗ 请指定要上传的文件路径{RESET}")
+        return
+    if len(args) > 1 or args[0] == "-" or os.path.isdir(args[0]):
+        cmd_upload_batch(nav, args)
+        return
+    file_path = args[0]
+    if not os.path.exists(file_path):
+        print(f"{RED}✗ 文件不存在: {file_path}{RESET}")
+        return
+    if not check_file_size(file_path):
+        return
+    upload_and_report(client, file_path, nav.current_folder_id)
+
 def upload_to_lanzou(username, password, file_path):
     try:
         print("\n=== 蓝奏云文件上传工具 ===")
@@ -631,44 +2514,33 @@ def upload_to_lanzou(username, password, file_path):
             return False
             
         # 创建客户端实例并登录
-        client = LanZouWeb()
-        if not client.login(username, password):
+        client = make_client()
+        if not client or not cli_login(client, username, password):
             return False
             
-        # 上传文件，最多重试3次
-        for i in range(3):
-            try:
-                share_link = client.upload_file(file_path)
-                if share_link:
-                    print("\n=== 上传结果 ===")
-                    print("✓ 文件上传成功!")
-                    print(f"✓ 分享链接: {share_link}")
-                    return True
-                else:
-                    if i < 2:
-                        print(f"\n[第{i+1}次上传失败]")
-                        print("等待5秒后重试...")
-                        time.sleep(5)
-                    else:
-                        print("\n=== 上传失败 ===")
-                        print("可能的原因:")
-                        print("1. 网络连接不稳定")
-                        print("2. 服务器响应异常")
-                        print("3. 文件类型不支持")
-                        return False
-            except Exception as e:
-                if i < 2:
-                    print(f"\n[第{i+1}次上传出错]")
-                    print(f"错误信息: {str(e)}")
-                    print("等待5秒后重试...")
-                    time.sleep(5)
-                else:
-                    return False
+        # 上传文件，按阶段重试
+        return upload_and_report(client, file_path, client.root_folder_id)
                     
     except Exception as e:
         print(f"✗ 发生错误: {str(e)}")
         return False
 
+def upload_and_report(client, file_path, folder_id) -> bool:
+    """上传单个文件并输出结果，失败时说明出错的阶段"""
+    try:
+        share_link = client.upload_with_retry(file_path, folder_id)
+    except UploadError as e:
+        print(f"\n{RED}=== 上传失败 ==={RESET}")
+        print(f"{YELLOW}失败阶段: {e.phase_name}{RESET}")
+        print(f"{RED}错误信息: {str(e)}{RESET}")
+        if e.file_id:
+            print(f"{CYAN}文件已上传成功(ID: {e.file_id})，可稍后使用 share 命令获取分享链接{RESET}")
+        return False
+    print(f"\n{BLUE}=== 上传结果 ==={RESET}")
+    print(f"{GREEN}✓ 文件上传成功!{RESET}")
+    print(f"{GREEN}✓ 分享链接: {share_link}{RESET}")
+    return True
+
 def mask_username(username: str) -> str:
     """处理用户名显示格式
     如果是手机号，只显示前三位和后四位，中间用*号代替
@@ -677,8 +2549,579 @@ def mask_username(username: str) -> str:
         return f"{username[:3]}****{username[-4:]}"
     return username
 
-def interactive_mode(client):
+def cmd_find(nav, args):
+    """find 命令: 在目录树中查找文件
+    用法: find [路径] [-name 模式] [-iname 模式] [-regex 正则] [-size [+-]N[KMG]] [-newer 日期|Nd] [-refresh]
+    """
+    client = nav.client
+    path = "."
+    options = {}
+    refresh = False
+    i = 0
+    if args and not args[0].startswith('-'):
+        path = args[0]
+        i = 1
+
+    try:
+        while i < len(args):
+            opt = args[i]
+            if opt == "-refresh":
+                refresh = True
+                i += 1
+                continue
+            if opt not in ("-name", "-iname", "-regex", "-size", "-newer") or i + 1 >= len(args):
+                print(f"{RED}✗ 无效的参数: {opt}{RESET}")
+                return
+            value = args[i + 1]
+            if opt == "-size":
+                options['size'] = parse_size_spec(value)
+            elif opt == "-newer":
+                options['newer'] = parse_newer_spec(value)
+            elif opt == "-regex":
+                re.compile(value)
+                options['regex'] = value
+            else:
+                options[opt[1:]] = value
+            i += 2
+    except (ValueError, re.error) as e:
+        print(f"{RED}✗ {str(e)}{RESET}")
+        return
+
+    resolved = nav.resolve_path(path)
+    if not resolved:
+        print(f"{RED}✗ 目录不存在: {path}{RESET}")
+        return
+    folder_id, full_path = resolved
+
+    start = time.time()
+    index = client.build_index(folder_id, full_path, refresh=refresh)
+    results = index.search(**options)
+    elapsed = (time.time() - start) * 1000
+
+    for dir_path, file in results:
+        print(f"{dir_path}/{file.name_all or file.name} {CYAN}({file.size}, {file.time}){RESET}")
+    print(f"\n{GREEN}✓ 找到 {len(results)} 个文件{RESET} (索引 {len(index)} 个文件，耗时 {elapsed:.0f}ms)")
+
+def collect_upload_jobs(client, paths: List[str], folder_id: str, recursive: bool,
+                        pack_threshold: int = None) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str, int]]]:
+    """把本地路径展开为上传任务，-r 时按本地目录结构在 folder_id 下创建对应的远程目录
+    Args:
+        folder_id: 目标文件夹ID
+        pack_threshold: 打包模式下的小文件阈值，不超过该大小的文件会被打包，None表示不打包
+    Returns:
+        Tuple: ([(本地文件路径, 目标文件夹ID)], [(待打包的本地路径, 归档内名称, 文件大小)])
+    """
+    jobs = []
+    members = []
+    for path in paths:
+        if os.path.isfile(path):
+            size = os.path.getsize(path)
+            if pack_threshold is not None and size <= pack_threshold:
+                members.append((path, os.path.basename(path), size))
+            else:
+                jobs.append((path, folder_id))
+        elif os.path.isdir(path):
+            if not recursive:
+                print(f"{YELLOW}! 跳过目录: {path} (上传目录请使用 upload -r){RESET}")
+                continue
+            root_name = os.path.basename(os.path.abspath(path))
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                rel_dir = os.path.normpath(os.path.join(root_name, os.path.relpath(dirpath, path)))
+                large_files = []
+                for name in sorted(filenames):
+                    file_path = os.path.join(dirpath, name)
+                    size = os.path.getsize(file_path)
+                    if pack_threshold is not None and size <= pack_threshold:
+                        members.append((file_path, os.path.join(rel_dir, name), size))
+                    else:
+                        large_files.append(file_path)
+                # 打包模式下只为需要单独上传的文件创建远程目录
+                if not large_files and pack_threshold is not None:
+                    continue
+                try:
+                    dir_id = client.make_dirs(folder_id, rel_dir)
+                except LanZouError as e:
+                    print(f"{RED}✗ 创建远程目录失败: {rel_dir} ({str(e)}){RESET}")
+                    continue
+                jobs.extend((file_path, dir_id) for file_path in large_files)
+        else:
+            print(f"{RED}✗ 文件不存在: {path}{RESET}")
+    return jobs, members
+
+def cmd_upload_batch(nav, args):
+    """批量上传: upload [-r] [--pack] [--limit 速率] [--small-first] [-j 并发数] <路径...>
+    打包参数: --pack-size 单个归档上限(默认90M) --pack-threshold 小文件阈值(默认1M) --pack-format zip|tar
+    标准输入: upload [--part-size 分卷大小] [--limit 速率] - <网盘文件名>
+    """
+    client = nav.client
+    recursive = False
+    small_first = False
+    workers = 1
+    limit = None
+    pack = False
+    pack_size = 90 * 1024 * 1024
+    pack_threshold = 1024 * 1024
+    pack_format = 'zip'
+    part_size = MAX_UPLOAD_SIZE
+    paths = []
+    i = 0
+    try:
+        while i < len(args):
+            arg = args[i]
+            if arg == "-r":
+                recursive = True
+            elif arg == "--pack":
+                pack = True
+            elif arg == "--small-first":
+                small_first = True
+            elif arg in ("--pack-size", "--pack-threshold", "--pack-format", "--part-size", "--limit", "-j"):
+                if i + 1 >= len(args):
+                    print(f"{RED}✗ 参数 {arg} 缺少值{RESET}")
+                    return
+                value = args[i + 1]
+                i += 1
+                if arg == "--limit":
+                    limit = parse_size_arg(value)
+                elif arg == "-j":
+                    workers = int(value)
+                elif arg == "--pack-format":
+                    if value not in PACK_FORMATS:
+                        print(f"{RED}✗ 不支持的归档格式: {value}{RESET}")
+                        return
+                    pack_format = value
+                    pack = True
+                elif arg == "--pack-size":
+                    pack_size = parse_size_arg(value)
+                    pack = True
+                elif arg == "--part-size":
+                    part_size = parse_size_arg(value)
+                else:
+                    pack_threshold = parse_size_arg(value)
+                    pack = True
+            else:
+                paths.append(arg)
+            i += 1
+    except ValueError as e:
+        print(f"{RED}✗ {str(e)}{RESET}")
+        return
+
+    if not paths:
+        print(f"{RED}✗ 请指定要上传的文件路径{RESET}")
+        return
+    if paths[0] == "-":
+        if len(paths) != 2:
+            print(f"{RED}✗ 用法: upload - <网盘文件名>{RESET}")
+            return
+        if not 0 < part_size <= MAX_UPLOAD_SIZE:
+            print(f"{RED}✗ 分卷大小必须在 0 到 {MAX_UPLOAD_SIZE // 1024 // 1024}MB 之间{RESET}")
+            return
+    elif pack and pack_size > MAX_UPLOAD_SIZE:
+        print(f"{RED}✗ 归档上限不能超过 {MAX_UPLOAD_SIZE // 1024 // 1024}MB{RESET}")
+        return
+
+    if paths[0] == "-":
+        jobs, members = [], []
+    else:
+        jobs, members = collect_upload_jobs(client, paths, nav.current_folder_id, recursive, min(pack_threshold, pack_size) if pack else None)
+        if not jobs and not members:
+            return
+
+    # --limit 只作用于本次上传，--limit 0 表示本次不限速
+    previous_limiter = client.rate_limiter
+    if limit is not None:
+        client.rate_limiter = make_rate_limiter(limit)
+        if client.rate_limiter:
+            print(f"{CYAN}上传限速: {limit / 1024 / 1024:.2f}MB/s{RESET}")
+        else:
+            print(f"{CYAN}本次上传不限速{RESET}")
+    try:
+        if paths[0] == "-":
+            upload_stdin(client, paths[1], nav.current_folder_id, part_size)
+        else:
+            upload_jobs(client, jobs, members, nav.current_folder_id, pack_size, pack_format, workers, small_first)
+    finally:
+        client.rate_limiter = previous_limiter
+
+def upload_stdin(client, file_name: str, folder_id: str, part_size: int = MAX_UPLOAD_SIZE) -> bool:
+    """把标准输入的数据上传到 folder_id，如: tar c dir | python lanzou_web.py upload - dir.tar"""
+    if sys.stdin.isatty():
+        print(f"{RED}✗ 标准输入是终端，请通过管道或重定向传入数据{RESET}")
+        return False
+    try:
+        results = client.upload_stream(sys.stdin.buffer, file_name, folder_id, part_size)
+    except UploadError as e:
+        print(f"{RED}✗ 上传失败({e.phase_name}): {str(e)}{RESET}")
+        if e.parts:
+            print(f"{YELLOW}以下 {len(e.parts)} 个分卷已经上传，保留在网盘中:{RESET}")
+            for result in e.parts:
+                print(f"{GREEN}✓ {result['name']}{RESET} {CYAN}{result['url']}{RESET}")
+        return False
+
+    if len(results) > 1:
+        print(f"\n{BLUE}=== 已分为 {len(results)} 个分卷上传 ==={RESET}")
+    for result in results:
+        print(f"{GREEN}✓ {result['name']}{RESET} {CYAN}{result['url']}{RESET}")
+    return True
+
+def upload_jobs(client, jobs, members, folder_id, pack_size, pack_format, workers, small_first):
+    """执行 collect_upload_jobs 生成的上传任务并输出结果"""
+    succeeded = 0
+    failed = 0
+    if members:
+        print(f"\n{BLUE}=== 打包上传 {len(members)} 个小文件 ==={RESET}")
+        for result in client.upload_packs(members, folder_id, pack_size, pack_format):
+            if result['error']:
+                failed += result['count']
+                print(f"{RED}✗ {result['archive']} ({result['count']} 个文件): {result['error']}{RESET}")
+            else:
+                succeeded += result['count']
+                print(f"{GREEN}✓ {result['archive']} ({result['count']} 个文件){RESET} {CYAN}{result['url'] or ''}{RESET}")
+        print(f"{CYAN}打包清单已保存到: {client.pack_manifest_file}{RESET}")
+
+    if jobs:
+        print(f"\n{BLUE}=== 批量上传 {len(jobs)} 个文件 ==={RESET}")
+        results = client.upload_batch(jobs, workers=workers, small_first=small_first)
+        print(f"\n{BLUE}=== 上传结果 ==={RESET}")
+        for result in results:
+            if result['error']:
+                failed += 1
+                print(f"{RED}✗ {result['path']}: {result['error']}{RESET}")
+            else:
+                succeeded += 1
+                print(f"{GREEN}✓ {result['path']}{RESET} {CYAN}{result['url']}{RESET}")
+
+    print(f"\n{GREEN}✓ 成功 {succeeded} 个{RESET}" + (f"，{RED}失败 {failed} 个{RESET}" if failed else ""))
+
+def watch_upload(client, watcher: DirectoryWatcher, remote_id: str, rel_paths: List[str],
+                 uploaded: Dict[str, Tuple[int, int]], workers: int = 1, skip_existing: bool = False) -> List[str]:
+    """把监视到的一批文件上传到远程目录中对应的位置
+    Args:
+        uploaded: 相对路径 -> 上次上传时的 (大小, 修改时间)，用于跳过没有变化的文件，上传成功后更新
+        skip_existing: 跳过远程目录中已有同名文件的文件(用于启动时的初始同步)
+    Returns:
+        List[str]: 上传失败、需要稍后重试的相对路径
+    Raises:
+        LanZouError: 查询远程目录等请求失败，整批都需要重试
+    """
+    failed = []
+    jobs = []
+    states = {}
+    folder_ids = {}
+    for rel_path in rel_paths:
+        file_path = os.path.join(watcher.root, rel_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue  # 上传前已被删除
+        state = (stat.st_size, stat.st_mtime_ns)
+        if uploaded.get(rel_path) == state:
+            continue
+        if stat.st_size > MAX_UPLOAD_SIZE:
+            print(f"{YELLOW}! 跳过超过 {MAX_UPLOAD_SIZE // 1024 // 1024}MB 的文件: {rel_path}{RESET}")
+            continue
+            
+        rel_dir = os.path.dirname(rel_path)
+        if rel_dir not in folder_ids:
+            try:
+                folder_ids[rel_dir] = client.make_dirs(remote_id, rel_dir) if rel_dir else remote_id
+            except LanZouError as e:
+                folder_ids[rel_dir] = None
+                print(f"{RED}✗ 创建远程目录失败: {rel_dir} ({str(e)}){RESET}")
+        folder_id = folder_ids[rel_dir]
+        if folder_id is None:
+            failed.append(rel_path)
+            continue
+        if skip_existing:
+            names = {file.name_all or file.name for file in client.get_files(folder_id, use_cache=True)}
+            if os.path.basename(rel_path) in names:
+                uploaded[rel_path] = state
+                continue
+        jobs.append((file_path, folder_id))
+        states[file_path] = (rel_path, state)
+        
+    if not jobs:
+        return failed
+    print(f"\n{BLUE}=== {datetime.now().strftime('%H:%M:%S')} 上传 {len(jobs)} 个文件 ==={RESET}")
+    for result in client.upload_batch(jobs, workers=workers):
+        rel_path, state = states[result['path']]
+        if result['error']:
+            failed.append(rel_path)
+            print(f"{RED}✗ {rel_path}: {result['error']}{RESET}")
+        else:
+            uploaded[rel_path] = state
+            print(f"{GREEN}✓ {rel_path}{RESET} {CYAN}{result['url']}{RESET}")
+    return failed
+
+def cmd_watch(nav, args):
+    """watch 命令: 监视本地目录，把新增或修改的文件上传到远程目录中对应的位置，Ctrl+C 停止
+    用法: watch <本地目录> <远程目录路径> [--settle 秒] [--interval 秒] [--ignore 模式] [--initial] [-j 并发数]
+    """
+    client = nav.client
+    settle = 2.0
+    interval = 5.0
+    ignore = list(WATCH_IGNORE)
+    initial = False
+    workers = 1
+    paths = []
+    i = 0
+    try:
+        while i < len(args):
+            arg = args[i]
+            if arg == "--initial":
+                initial = True
+            elif arg in ("--settle", "--interval", "--ignore", "-j"):
+                if i + 1 >= len(args):
+                    print(f"{RED}✗ 参数 {arg} 缺少值{RESET}")
+                    return
+                value = args[i + 1]
+                i += 1
+                if arg == "--settle":
+                    settle = float(value)
+                elif arg == "--interval":
+                    interval = float(value)
+                elif arg == "-j":
+                    workers = int(value)
+                else:
+                    ignore.append(value)
+            else:
+                paths.append(arg)
+            i += 1
+    except ValueError as e:
+        print(f"{RED}✗ 参数错误: {str(e)}{RESET}")
+        return
+        
+    if len(paths) != 2:
+        print(f"{RED}✗ 用法: watch <本地目录> <远程目录路径>{RESET}")
+        return
+    local_dir, remote_path = paths
+    if not os.path.isdir(local_dir):
+        print(f"{RED}✗ 本地目录不存在: {local_dir}{RESET}")
+        return
+    resolved = nav.resolve_path(remote_path)
+    if not resolved:
+        print(f"{RED}✗ 目录不存在: {remote_path}{RESET}")
+        return
+    remote_id, full_path = resolved
+    
+    watcher = DirectoryWatcher(local_dir, settle=settle, poll_interval=interval, ignore=tuple(ignore),
+                               on_warning=lambda message: print(f"{YELLOW}! {message}{RESET}"))
+    uploaded = {}
+    failures = {}  # 相对路径 -> 连续失败次数
+    
+    def process(batch: List[str], skip_existing: bool = False):
+        try:
+            failed = set(watch_upload(client, watcher, remote_id, batch, uploaded, workers, skip_existing))
+        except LanZouError as e:
+            print(f"{RED}✗ {str(e)}{RESET}")
+            failed = set(batch)
+        # 网络等问题不结束监视，失败的文件按退避时间重新排队，网络恢复后自动补传
+        for rel_path in batch:
+            if rel_path not in failed:
+                failures.pop(rel_path, None)
+        for rel_path in failed:
+            failures[rel_path] = failures.get(rel_path, 0) + 1
+            watcher.requeue([rel_path], backoff_delay(failures[rel_path], cap=300))
+        if failed:
+            print(f"{YELLOW}! {len(failed)} 个文件稍后重试{RESET}")
+    
+    print(f"\n{BLUE}正在监视 {watcher.root} -> {full_path} ({watcher.backend}){RESET}")
+    print(f"{CYAN}按 Ctrl+C 停止{RESET}")
+    try:
+        if initial:
+            process(watcher.scan(), skip_existing=True)
+        while True:
+            process(watcher.wait_batch())
+    except KeyboardInterrupt:
+        print(f"\n{YELLOW}已停止监视{RESET}")
+    finally:
+        watcher.close()
+
+def cmd_mv(nav, args):
+    """mv 命令: 在服务器端把当前目录下的文件移动到其他目录
+    用法: mv <文件名|通配符 ...> <目标目录路径>
+    """
+    client = nav.client
+    if len(args) < 2:
+        print(f"{RED}✗ 用法: mv <文件名|通配符 ...> <目标目录路径>{RESET}")
+        return
+    patterns, target_path = args[:-1], args[-1]
+
+    resolved = nav.resolve_path(target_path)
+    if not resolved:
+        print(f"{RED}✗ 目录不存在: {target_path}{RESET}")
+        return
+    target_id, full_path = resolved
+    if target_id == nav.current_folder_id:
+        print(f"{RED}✗ 目标目录与当前目录相同{RESET}")
+        return
+
+    files = [file for file in client.get_files(nav.current_folder_id, use_cache=True)
+             if any(fnmatch.fnmatchcase(file.name_all or file.name, pattern) for pattern in patterns)]
+    if not files:
+        print(f"{RED}✗ 没有匹配的文件{RESET}")
+        return
+
+    print(f"\n{BLUE}正在移动 {len(files)} 个文件到 {full_path}{RESET}")
+    with tqdm(total=len(files), unit='个', desc="移动进度", ncols=100) as pbar:
+        results = client.move_files([file.id for file in files], target_id, callback=lambda *_: pbar.update(1))
+
+    for file in files:
+        if results.get(file.id):
+            print(f"{RED}✗ {file.name_all or file.name}: {str(results[file.id])}{RESET}")
+    moved = sum(1 for error in results.values() if error is None)
+    failed = len(results) - moved
+    print(f"\n{GREEN}✓ 移动成功 {moved} 个{RESET}" + (f"，{RED}失败 {failed} 个{RESET}" if failed else ""))
+
+def export_share_rows(rows: List[Dict], output: str):
+    """导出分享链接，根据扩展名选择 JSON 或 CSV 格式"""
+    if output.lower().endswith('.json'):
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    else:
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['path', 'name', 'size', 'file_id', 'url', 'pwd'])
+            writer.writeheader()
+            writer.writerows(rows)
+
+def cmd_share(nav, args):
+    """share 命令: 批量获取分享链接
+    用法: share [名称|通配符 ...] [-r 目录] [-o 输出文件.csv|.json] [-refresh]
+    """
+    client = nav.client
+    patterns = []
+    recursive_path = None
+    output = None
+    refresh = False
+    i = 0
+    while i < len(args):
+        opt = args[i]
+        if opt in ("-r", "-o"):
+            if i + 1 >= len(args):
+                print(f"{RED}✗ 参数 {opt} 缺少值{RESET}")
+                return
+            if opt == "-r":
+                recursive_path = args[i + 1]
+            else:
+                output = args[i + 1]
+            i += 2
+            continue
+        if opt == "-refresh":
+            refresh = True
+        else:
+            patterns.append(opt)
+        i += 1
+
+    if not patterns and recursive_path is None:
+        print(f"{RED}✗ 请指定文件名、通配符或 -r 目录{RESET}")
+        return
+
+    if recursive_path is not None:
+        resolved = nav.resolve_path(recursive_path)
+        if not resolved:
+            print(f"{RED}✗ 目录不存在: {recursive_path}{RESET}")
+            return
+        entries = client.walk_files(resolved[0], resolved[1], use_cache=not refresh)
+    else:
+        entries = [(nav.get_current_path(), file)
+                   for file in client.get_files(nav.current_folder_id, use_cache=not refresh)]
+
+    if patterns:
+        entries = [(path, file) for path, file in entries
+                   if any(fnmatch.fnmatchcase(file.name_all or file.name, pattern) for pattern in patterns)]
+    if not entries:
+        print(f"{RED}✗ 没有匹配的文件{RESET}")
+        return
+
+    print(f"\n{BLUE}正在获取 {len(entries)} 个文件的分享链接...{RESET}")
+    infos = client.get_share_infos([file.id for _, file in entries], use_cache=not refresh)
+
+    rows = []
+    for path, file in entries:
+        info = infos.get(file.id)
+        if not info:
+            continue
+        name = file.name_all or file.name
+        rows.append({
+            'path': f"{path}/{name}",
+            'name': name,
+            'size': file.size,
+            'file_id': file.id,
+            'url': info['url'],
+            'pwd': info.get('pwd', '')
+        })
+        pwd = f" 提取码: {info['pwd']}" if info.get('pwd') else ""
+        print(f"├─ {name} {CYAN}{info['url']}{pwd}{RESET}")
+
+    failed = len(entries) - len(rows)
+    print(f"\n{GREEN}✓ 获取成功 {len(rows)} 个{RESET}" + (f"，{RED}失败 {failed} 个{RESET}" if failed else ""))
+    if output:
+        try:
+            export_share_rows(rows, output)
+            print(f"{GREEN}✓ 已导出到: {output}{RESET}")
+        except Exception as e:
+            print(f"{RED}✗ 导出失败: {str(e)}{RESET}")
+
+INTERACTIVE_COMMANDS = ['pwd', 'ls', 'cd', 'mkdir', 'rmdir', 'upload', 'rm', 'mv', 'find', 'share', 'watch', 'help', 'exit']
+
+def make_completer(nav):
+    """创建 readline 补全函数，目录和文件名只从预取的缓存中读取，按 Tab 时不会等待网络"""
+    client = nav.client
+    def names_in(path_prefix: str, want_folders: bool) -> List[str]:
+        directory, _, _ = path_prefix.rpartition('/')
+        if directory or path_prefix.startswith('/'):
+            resolved = nav.resolve_path(directory or '/', cache_only=True)
+            if not resolved:
+                return []
+            folder_id = resolved[0]
+            prefix = directory + '/'
+        else:
+            folder_id = nav.current_folder_id
+            prefix = ''
+        folders, files = client.peek_cache(folder_id)
+        if folders is None or files is None:
+            client.prefetch(folder_id, depth=0)
+        names = [prefix + folder.name + '/' for folder in folders or []]
+        if not want_folders:
+            names = [prefix + (file.name_all or file.name) for file in files or []]
+        return names
+
+    def complete(text: str, state: int):
+        try:
+            words = readline.get_line_buffer()[:readline.get_begidx()].split()
+            if not words:
+                candidates = INTERACTIVE_COMMANDS
+            else:
+                command = words[0].lower()
+                if command in ('cd', 'rmdir', 'find'):
+                    candidates = names_in(text, want_folders=True)
+                elif command in ('rm', 'share'):
+                    candidates = names_in(text, want_folders=False)
+                elif command == 'mv':
+                    candidates = names_in(text, want_folders=False) + names_in(text, want_folders=True)
+                else:
+                    candidates = []
+            matches = [name for name in candidates if name.startswith(text)]
+            return matches[state] if state < len(matches) else None
+        except Exception:
+            return None
+
+    return complete
+
+def setup_completion(nav):
+    """启用交互模式的 Tab 补全"""
+    if readline is None:
+        return
+    readline.set_completer(make_completer(nav))
+    readline.set_completer_delims(" \t\n")
+    if 'libedit' in (readline.__doc__ or ''):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+
+def interactive_mode(nav):
     """交互式命令行模式"""
+    client = nav.client
     print(f"\n{BLUE}██╗      █████╗ ███╗   ██╗███████╗ ██████╗ ██╗   ██╗{RESET}")
     print(f"{BLUE}██║     ██╔══██╗████╗  ██║╚══███╔╝██╔═══██╗██║   ██║{RESET}")
     print(f"{BLUE}██║     ███████║██╔██╗ ██║  ███╔╝ ██║   ██║██║   ██║{RESET}")
@@ -693,13 +3136,21 @@ def interactive_mode(client):
     raw_username = client.user_info.get('username') or LANZOU_CONFIG.get("username", "user")
     username = mask_username(raw_username)
     
+    # 后台预取当前目录及子目录，并启用 Tab 补全
+    setup_completion(nav)
+    client.prefetch(nav.current_folder_id)
+    
     while True:
         try:
             # 显示提示符
-            cwd = client.get_current_path()
+            cwd = nav.get_current_path()
             # Ubuntu风格的提示符: username@lanzou:path$
             prompt = f"{BOLD}{GREEN}{username}@lanzou{RESET}{BOLD}:{BLUE}{cwd}{RESET}$ "
-            cmd = input(f"\n{prompt}").strip()
+            if readline:
+                # 告诉 readline 颜色控制符不占宽度，避免编辑长命令时光标错位
+                prompt = re.sub(r'(\033\[[0-9;]*m)', '\001\\1\002', prompt)
+            print()
+            cmd = input(prompt).strip()
             
             if not cmd:
                 continue
@@ -722,104 +3173,51 @@ def interactive_mode(client):
                 print(f"{CYAN}mkdir <目录名>       {RESET}创建目录")
                 print(f"{CYAN}rmdir <目录名>       {RESET}删除目录")
                 print(f"{CYAN}upload <文件路径>    {RESET}上传文件")
+                print(f"{CYAN}upload [-r] <路径..> {RESET}批量上传文件，-r 上传整个目录")
+                print(f"{CYAN}upload --pack ...    {RESET}把小文件打包成zip/tar后上传 (--pack-size/--pack-threshold/--pack-format)")
+                print(f"{CYAN}upload --limit 20M   {RESET}限制总上传速率，可配合 -j 并发数、--small-first 小文件优先")
                 print(f"{CYAN}rm <文件名>          {RESET}删除文件")
+                print(f"{CYAN}mv <文件名..> <目录> {RESET}移动文件到其他目录 (支持通配符，不重新上传)")
+                print(f"{CYAN}find [路径] [条件]   {RESET}查找文件 (-name/-iname/-regex/-size/-newer)")
+                print(f"{CYAN}share <文件名|通配符> {RESET}获取分享链接 (-r 目录 递归，-o 文件.csv/.json 导出)")
+                print(f"{CYAN}watch <本地> <远程>  {RESET}监视本地目录，自动上传新增或修改的文件 (--initial 先同步已有文件)")
                 print(f"{CYAN}help                 {RESET}显示帮助信息")
                 print(f"{CYAN}exit                 {RESET}退出程序")
                 
             elif command == "pwd":
-                client.pwd()
+                cmd_pwd(nav)
                 
             elif command == "ls":
-                client.list_dir(client.current_folder_id)
+                print_dir(nav)
+                client.prefetch(nav.current_folder_id)
                 
             elif command == "cd":
-                if not args:
-                    print(f"{RED}✗ 请指定目录名{RESET}")
-                    continue
-                folder_name = args[0]
-                client.cd(folder_name)
+                if cmd_cd(nav, args):
+                    client.prefetch(nav.current_folder_id)
                 
             elif command == "mkdir":
-                if not args:
-                    print(f"{RED}✗ 请指定目录名{RESET}")
-                    continue
-                folder_name = args[0]
-                client.create_folder(folder_name, client.current_folder_id)
+                cmd_mkdir(nav, args)
                 
             elif command == "rmdir":
-                if not args:
-                    print(f"{RED}✗ 请指定要删除的目录名{RESET}")
-                    continue
-                folder_name = args[0]
-                # 获取当前目录下的所有文件夹
-                folders = client.get_folders(client.current_folder_id)
-                # 查找目标文件夹
-                target_folder = None
-                for folder in folders:
-                    if folder.name == folder_name:
-                        target_folder = folder
-                        break
-                if not target_folder:
-                    print(f"{RED}✗ 目录不存在: {folder_name}{RESET}")
-                    continue
-                client.delete_folder(target_folder.folder_id)
+                cmd_rmdir(nav, args)
                 
             elif command == "upload":
-                if not args:
-                    print(f"{RED}✗ 请指定要上传的文件路径{RESET}")
-                    continue
-                file_path = args[0]
-                
-                if not os.path.exists(file_path):
-                    print(f"{RED}✗ 文件不存在: {file_path}{RESET}")
-                    continue
-                    
-                if not check_file_size(file_path):
-                    continue
-                    
-                for i in range(3):
-                    try:
-                        share_link = client.upload_file(file_path, client.current_folder_id)
-                        if share_link:
-                            print(f"\n{BLUE}=== 上传结果 ==={RESET}")
-                            print(f"{GREEN}✓ 文件上传成功!{RESET}")
-                            print(f"{GREEN}✓ 分享链接: {share_link}{RESET}")
-                            break
-                        else:
-                            if i < 2:
-                                print(f"\n{YELLOW}[第{i+1}次上传失败]{RESET}")
-                                print(f"{YELLOW}等待5秒后重试...{RESET}")
-                                time.sleep(5)
-                            else:
-                                print(f"\n{RED}=== 上传失败 ==={RESET}")
-                                print(f"{YELLOW}可能的原因:{RESET}")
-                                print("1. 网络连接不稳定")
-                                print("2. 服务器响应异常")
-                                print("3. 文件类型不支持")
-                    except Exception as e:
-                        if i < 2:
-                            print(f"\n{YELLOW}[第{i+1}次上传出错]{RESET}")
-                            print(f"{RED}错误信息: {str(e)}{RESET}")
-                            print(f"{YELLOW}等待5秒后重试...{RESET}")
-                            time.sleep(5)
+                cmd_upload(nav, args)
                             
             elif command == "rm":
-                if not args:
-                    print(f"{RED}✗ 请指定要删除的文件名{RESET}")
-                    continue
-                file_name = args[0]
-                # 获取当前目录下的所有文件
-                files = client.get_files(client.current_folder_id)
-                # 查找目标文件
-                target_file = None
-                for file in files:
-                    if file.name == file_name:
-                        target_file = file
-                        break
-                if not target_file:
-                    print(f"{RED}✗ 文件不存在: {file_name}{RESET}")
-                    continue
-                client.delete_file(target_file.id)
+                cmd_rm(nav, args)
+                
+            elif command == "find":
+                cmd_find(nav, args)
+                
+            elif command == "share":
+                cmd_share(nav, args)
+                
+            elif command == "mv":
+                cmd_mv(nav, args)
+                
+            elif command == "watch":
+                cmd_watch(nav, args)
                 
             else:
                 print(f"{RED}✗ 未知命令: {command}{RESET}")
@@ -847,118 +3245,57 @@ def main():
             return
             
         # 创建客户端实例并登录
-        client = LanZouWeb()
-        if not client.login(username, password):
-            return
+        client = make_client()
+        if not client or not cli_login(client, username, password):
+            sys.exit(1)  # 登录失败直接退出
             
         # 进入交互模式
-        interactive_mode(client)
+        interactive_mode(NavigationContext(client))
         return
         
     # 创建客户端实例并登录
     username = LANZOU_CONFIG.get("username")
     password = LANZOU_CONFIG.get("password")
-    client = LanZouWeb()
-    if not client.login(username, password):
-        return
+    client = make_client()
+    if not client or not cli_login(client, username, password):
+        sys.exit(1)  # 登录失败直接退出
         
     command = sys.argv[1].lower()
+    nav = NavigationContext(client)
     
     try:
         if command == "pwd":
-            client.pwd()
+            cmd_pwd(nav)
             
         elif command == "ls":
-            client.list_dir(client.current_folder_id)
+            print_dir(nav)
             
         elif command == "cd":
-            if len(sys.argv) < 3:
-                print("✗ 请指定目录名")
-                return
-            folder_name = sys.argv[2]
-            client.cd(folder_name)
+            cmd_cd(nav, sys.argv[2:])
             
         elif command == "mkdir":
-            if len(sys.argv) < 3:
-                print("✗ 请指定目录名")
-                return
-            folder_name = sys.argv[2]
-            client.create_folder(folder_name, client.current_folder_id)
+            cmd_mkdir(nav, sys.argv[2:])
             
         elif command == "rmdir":
-            if len(sys.argv) < 3:
-                print("✗ 请指定要删除的目录名")
-                return
-            folder_name = sys.argv[2]
-            # 获取当前目录下的所有文件夹
-            folders = client.get_folders(client.current_folder_id)
-            # 查找目标文件夹
-            target_folder = None
-            for folder in folders:
-                if folder.name == folder_name:
-                    target_folder = folder
-                    break
-            if not target_folder:
-                print(f"✗ 目录不存在: {folder_name}")
-                return
-            client.delete_folder(target_folder.folder_id)
+            cmd_rmdir(nav, sys.argv[2:])
             
         elif command == "upload":
-            if len(sys.argv) < 3:
-                print("✗ 请指定要上传的文件路径")
-                return
-            file_path = sys.argv[2]
-            
-            if not os.path.exists(file_path):
-                print(f"✗ 文件不存在: {file_path}")
-                return
-                
-            if not check_file_size(file_path):
-                return
-                
-            for i in range(3):
-                try:
-                    share_link = client.upload_file(file_path, client.current_folder_id)
-                    if share_link:
-                        print(f"\n{BLUE}=== 上传结果 ==={RESET}")
-                        print(f"{GREEN}✓ 文件上传成功!{RESET}")
-                        print(f"{GREEN}✓ 分享链接: {share_link}{RESET}")
-                        break
-                    else:
-                        if i < 2:
-                            print(f"\n{YELLOW}[第{i+1}次上传失败]{RESET}")
-                            print(f"{YELLOW}等待5秒后重试...{RESET}")
-                            time.sleep(5)
-                        else:
-                            print(f"\n{RED}=== 上传失败 ==={RESET}")
-                            print(f"{YELLOW}可能的原因:{RESET}")
-                            print("1. 网络连接不稳定")
-                            print("2. 服务器响应异常")
-                            print("3. 文件类型不支持")
-                except Exception as e:
-                    if i < 2:
-                        print(f"\n{YELLOW}[第{i+1}次上传出错]{RESET}")
-                        print(f"{RED}错误信息: {str(e)}{RESET}")
-                        print(f"{YELLOW}等待5秒后重试...{RESET}")
-                        time.sleep(5)
+            cmd_upload(nav, sys.argv[2:])
                         
         elif command == "rm":
-            if len(sys.argv) < 3:
-                print("✗ 请指定要删除的文件名")
-                return
-            file_name = args[0]
-            # 获取当前目录下的所有文件
-            files = client.get_files(client.current_folder_id)
-            # 查找目标文件
-            target_file = None
-            for file in files:
-                if file.name == file_name:
-                    target_file = file
-                    break
-            if not target_file:
-                print(f"✗ 文件不存在: {file_name}")
-                return
-            client.delete_file(target_file.id)
+            cmd_rm(nav, sys.argv[2:])
+            
+        elif command == "find":
+            cmd_find(nav, sys.argv[2:])
+            
+        elif command == "share":
+            cmd_share(nav, sys.argv[2:])
+            
+        elif command == "mv":
+            cmd_mv(nav, sys.argv[2:])
+            
+        elif command == "watch":
+            cmd_watch(nav, sys.argv[2:])
             
         else:
             print(f"✗ 未知命令: {command}")
@@ -969,8 +3306,13 @@ def main():
             print("4. 返回上级目录:   python lanzou_web.py cd ..")
             print("5. 创建目录:       python lanzou_web.py mkdir <目录名>")
             print("6. 删除目录:       python lanzou_web.py rmdir <目录名>")
-            print("7. 上传文件:       python lanzou_web.py upload <文件路径>")
+            print("7. 上传文件:       python lanzou_web.py upload [-r] [--pack] [--limit 20M] [-j 2] [--small-first] <文件路径...>")
             print("8. 删除文件:       python lanzou_web.py rm <文件名>")
+            print("9. 查找文件:       python lanzou_web.py find [路径] [-name 模式] [-size +10M] [-newer 7d]")
+            print("10. 获取分享链接:  python lanzou_web.py share <文件名|通配符> | -r <目录> [-o links.csv]")
+            print("11. 移动文件:      python lanzou_web.py mv <文件名|通配符...> <目标目录路径>")
+            print("12. 从管道上传:    tar c 目录 | python lanzou_web.py upload [--part-size 90M] - <网盘文件名>")
+            print("13. 监视目录:      python lanzou_web.py watch <本地目录> <远程目录路径> [--initial] [--settle 2]")
             print("\n或者直接运行 python lanzou_web.py 进入交互模式")
             
     except Exception as e:
@@ -0,0 +1,99 @@
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+from requests.cookies import extract_cookies_to_jar
+
+import lanzou_web
+
+
+def set_cookie_response(cookie):
+    """只带 Set-Cookie 头的响应，requests 用它把 cookie 合并进 session"""
+    msg = http.client.HTTPMessage()
+    msg["Set-Cookie"] = cookie
+    return SimpleNamespace(_original_response=SimpleNamespace(msg=msg))
+
+
+class CookieLockTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        self.client.cookie_file = os.path.join(self.tmp.name, "cookie.json")
+
+    def test_response_cookies_merge_under_cookie_lock(self):
+        request = requests.Request("POST", "https://up.woozooo.com/doupload.php").prepare()
+        merge = threading.Thread(target=extract_cookies_to_jar, args=(
+            self.client.session.cookies, request, set_cookie_response("phpdisk_info=new; path=/")))
+        with self.client._cookie_lock:
+            merge.start()
+            merge.join(0.2)
+            self.assertTrue(merge.is_alive())
+            self.assertNotIn("phpdisk_info", self.client.session.cookies)
+        merge.join()
+        self.assertEqual(self.client.session.cookies["phpdisk_info"], "new")
+
+    def test_save_cookies_while_responses_merge(self):
+        request = requests.Request("POST", "https://up.woozooo.com/doupload.php").prepare()
+        stop = threading.Event()
+        errors = []
+
+        def merge():
+            # 反复添加、删除 cookie，jar 的大小一直在变，但不会无限增长
+            i = 0
+            while not stop.is_set():
+                name = f"c{i % 50}"
+                extract_cookies_to_jar(self.client.session.cookies, request, set_cookie_response(f"{name}=v; path=/"))
+                extract_cookies_to_jar(self.client.session.cookies, request,
+                                       set_cookie_response(f"{name}=; path=/; Max-Age=0"))
+                i += 1
+
+        thread = threading.Thread(target=merge)
+        thread.start()
+        try:
+            for _ in range(200):
+                try:
+                    self.client.save_cookies()
+                except RuntimeError as e:  # 遍历时 cookie 被修改
+                    errors.append(e)
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(errors, [])
+        with open(self.client.cookie_file) as f:
+            self.assertIsInstance(json.load(f), dict)
+
+
+class WriteJsonAtomicTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "cookie.json")
+        lanzou_web.write_json_atomic(self.path, {"phpdisk_info": "old"})
+
+    def assert_unchanged(self):
+        self.assertEqual(os.listdir(self.tmp.name), ["cookie.json"])
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"phpdisk_info": "old"})
+
+    def test_serialization_error_leaves_old_file(self):
+        # json.dump 写出一部分后才遇到无法序列化的值
+        with self.assertRaises(TypeError):
+            lanzou_web.write_json_atomic(self.path, {"a": "x" * 100000, "b": object()})
+        self.assert_unchanged()
+
+    def test_replace_error_leaves_old_file(self):
+        with mock.patch.object(lanzou_web.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                lanzou_web.write_json_atomic(self.path, {"phpdisk_info": "new"})
+        self.assert_unchanged()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import fnmatch
+import unittest
+from datetime import datetime
+
+import lanzou_web
+
+
+def make_index():
+    files = [
+        ("Report-2024.PDF", "1.2 M", "2024-01-02"),
+        ("report-draft.txt", "512.0 K", "3 天前"),
+        ("photo.jpg", "1.0 M", "昨天"),
+        ("a.b", "100 B", "2023-12-31 23:59"),
+        ("notes.md", "未知", ""),
+    ]
+    return lanzou_web.FileIndex([
+        ("/docs", lanzou_web.FileInfo({"name_all": name, "size": size, "time": time})) for name, size, time in files])
+
+
+class FileIndexSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.index = make_index()
+
+    def names(self, **conditions):
+        return [file.name_all for _, file in self.index.search(**conditions)]
+
+    def test_name_patterns(self):
+        cases = [
+            ({"name": "*report*"}, ["report-draft.txt"]),
+            ({"name": "Report*"}, ["Report-2024.PDF"]),
+            ({"iname": "*REPORT*"}, ["Report-2024.PDF", "report-draft.txt"]),
+            ({"iname": "*.pdf"}, ["Report-2024.PDF"]),
+            ({"name": "re[p]ort-*"}, ["report-draft.txt"]),
+            ({"name": "ph?to.jpg"}, ["photo.jpg"]),
+            ({"name": "*.b"}, ["a.b"]),
+            ({"name": "*missing*"}, []),
+            ({"regex": r"^\w+\.(md|jpg)$"}, ["photo.jpg", "notes.md"]),
+            ({"iname": "*report*", "regex": "txt$"}, ["report-draft.txt"]),
+        ]
+        for conditions, expected in cases:
+            with self.subTest(**conditions):
+                self.assertEqual(self.names(**conditions), expected)
+
+    def test_candidates_never_drop_a_match(self):
+        # 三元组只用于缩小候选范围，结果必须与逐个 fnmatch 一致
+        for pattern in ("*port*", "*-20[0-9]4*", "*draft.t?t", "[rR]eport*", "*.*", "photo*", "x*"):
+            with self.subTest(pattern=pattern):
+                expected = [file.name_all for _, file in self.index.entries
+                            if fnmatch.fnmatchcase(file.name_all.lower(), pattern.lower())]
+                self.assertEqual(self.names(iname=pattern), expected)
+
+    def test_glob_literals_split_on_wildcards_and_classes(self):
+        cases = [
+            ("*report*", [0, 1]),  # 索引不区分大小写，精确匹配交给 search
+            ("rep*raft", [1]),
+            ("re[p]ort-*", [0, 1]),  # 字面量 "ort-" 同时出现在两个文件名中
+            ("a?b", range(5)),  # 没有长度 >= 3 的字面量，返回全部条目
+            ("*xyz*", []),
+        ]
+        for pattern, expected in cases:
+            with self.subTest(pattern=pattern):
+                self.assertEqual(list(self.index._candidates(pattern)), list(expected))
+
+    def test_size_filters(self):
+        cases = [
+            ("+1M", ["Report-2024.PDF"]),
+            ("-1M", ["report-draft.txt", "a.b"]),
+            ("1M", ["report-draft.txt", "photo.jpg", "a.b"]),  # 与 find 相同，按单位向上取整
+            ("2M", ["Report-2024.PDF"]),
+            ("512K", ["report-draft.txt"]),
+            ("1K", ["a.b"]),
+            ("100", ["a.b"]),
+        ]
+        for spec, expected in cases:
+            with self.subTest(spec=spec):
+                self.assertEqual(self.names(size=lanzou_web.parse_size_spec(spec)), expected)
+
+    def test_newer_filter(self):
+        self.assertEqual(self.names(newer=datetime(2024, 1, 1)), ["Report-2024.PDF", "report-draft.txt", "photo.jpg"])
+
+
+class ParseTest(unittest.TestCase):
+    def test_parse_size_text(self):
+        cases = [
+            ("1.2 M", int(1.2 * 1024 ** 2)),
+            ("512.0 K", 512 * 1024),
+            ("100 B", 100),
+            ("2 G", 2 * 1024 ** 3),
+            ("1.5m", int(1.5 * 1024 ** 2)),
+            ("42", 42),
+            ("未知", -1),
+            ("", -1),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(lanzou_web.parse_size_text(text), expected)
+
+    def test_parse_size_spec(self):
+        cases = [
+            ("+10M", ("+", 10.0, 1024 ** 2)),
+            ("-1.5k", ("-", 1.5, 1024)),
+            ("2GB", ("", 2.0, 1024 ** 3)),
+            ("100", ("", 100.0, 1)),
+        ]
+        for spec, expected in cases:
+            with self.subTest(spec=spec):
+                self.assertEqual(lanzou_web.parse_size_spec(spec), expected)
+        for spec in ("", "M", "10X", "++1M"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                lanzou_web.parse_size_spec(spec)
+
+    def test_parse_lanzou_time(self):
+        now = datetime(2024, 5, 10, 15, 30, 45)
+        cases = [
+            ("刚刚", now),
+            ("10 秒前", datetime(2024, 5, 10, 15, 30, 35)),
+            ("5 分钟前", datetime(2024, 5, 10, 15, 25, 45)),
+            ("2小时前", datetime(2024, 5, 10, 13, 30, 45)),
+            ("3 天前", datetime(2024, 5, 7, 15, 30, 45)),
+            ("昨天", datetime(2024, 5, 9)),
+            ("前天", datetime(2024, 5, 8)),
+            ("2024-01-02", datetime(2024, 1, 2)),
+            ("2024-01-02 08:09", datetime(2024, 1, 2, 8, 9)),
+            (" 2024-01-02 08:09:10 ", datetime(2024, 1, 2, 8, 9, 10)),
+            ("上周", None),
+            ("", None),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(lanzou_web.parse_lanzou_time(text, now), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import unittest
+
+import requests
+
+import lanzou_web
+
+
+class FakeFiles:
+    """模拟 task 5 的文件列表接口和 task 20 的移动接口，记录列表请求次数"""
+    def __init__(self):
+        self.files = {"1": [("a", "a.txt"), ("b", "b.txt")], "2": [("c", "c.txt")], "3": []}
+        self.listings = 0
+
+    def post(self, url, data=None, **kwargs):
+        if data["task"] == "20":
+            for folder_id, files in self.files.items():
+                self.files[folder_id] = [item for item in files if item[0] != data["file_id"]]
+                if len(self.files[folder_id]) != len(files):
+                    moved = next(item for item in files if item[0] == data["file_id"])
+            self.files[data["folder_id"]].append(moved)
+            reply = {"zt": 1, "info": "移动成功"}
+        else:
+            self.listings += 1
+            text = [{"id": fid, "name_all": name, "size": "1.0 K", "folder_id": data["folder_id"]}
+                    for fid, name in self.files[data["folder_id"]]]
+            reply = {"zt": 1, "info": 1, "text": text}
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(reply).encode()
+        return response
+
+
+class MoveCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeFiles()
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        self.client.is_login = True
+        self.client.session.post = self.server.post
+
+    def cached(self, folder_id):
+        return [(file.id, file.folder_id) for file in self.client.peek_cache(folder_id)[1]]
+
+    def test_move_between_cached_folders(self):
+        source = self.client.get_files("1")
+        self.client.get_files("2")
+        self.client.move_file("a", "2")
+
+        self.assertEqual(self.cached("1"), [("b", "1")])
+        self.assertEqual(self.cached("2"), [("c", "2"), ("a", "2")])
+        # 之前返回给调用方的列表和对象保持不变
+        self.assertEqual([(file.id, file.folder_id) for file in source], [("a", "1"), ("b", "1")])
+        self.assertEqual(self.server.listings, 2)
+
+        # 缓存与服务器一致
+        self.assertEqual(self.cached("2"), [(file.id, file.folder_id) for file in self.client.get_files("2", use_cache=False)])
+
+    def test_move_back_and_forth(self):
+        self.client.get_files("1")
+        self.client.get_files("2")
+        self.client.move_file("a", "2")
+        self.client.move_file("a", "1")
+        self.assertEqual(self.cached("1"), [("b", "1"), ("a", "1")])
+        self.assertEqual(self.cached("2"), [("c", "2")])
+
+    def test_move_into_uncached_folder(self):
+        self.client.get_files("1")
+        self.client.move_file("a", "3")
+        self.assertEqual(self.cached("1"), [("b", "1")])
+        self.assertIsNone(self.client.peek_cache("3")[1])
+        self.assertEqual([file.id for file in self.client.get_files("3")], ["a"])
+
+    def test_move_from_uncached_folder_refetches_target(self):
+        self.client.get_files("2")
+        self.client.move_file("a", "2")
+        self.assertIsNone(self.client.peek_cache("2")[1])
+        self.assertEqual([file.id for file in self.client.get_files("2")], ["c", "a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
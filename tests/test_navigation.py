@@ -0,0 +1,67 @@
+import json
+import unittest
+
+import requests
+
+import lanzou_web
+
+
+class FakeFolders:
+    """模拟 task 47 的文件夹列表接口和 task 2 的新建文件夹接口，记录请求次数"""
+    def __init__(self):
+        self.folders = {"-1": [("10", "docs")], "10": []}
+        self.requests = 0
+
+    def post(self, url, data=None, files=None, **kwargs):
+        self.requests += 1
+        if data["task"] == "2":
+            folder_id = str(100 + self.requests)
+            self.folders.setdefault(data["parent_id"], []).append((folder_id, data["folder_name"]))
+            self.folders[folder_id] = []
+            reply = {"zt": 1, "info": "创建成功", "text": folder_id}
+        else:
+            children = self.folders.get(data["folder_id"], [])
+            text = [{"name": name, "fol_id": fid, "folderid": fid, "folder_des": ""} for fid, name in children]
+            reply = {"zt": 1, "info": "", "text": text or {"folderid": data["folder_id"]}}
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(reply).encode()
+        return response
+
+
+class NavigationTest(unittest.TestCase):
+    def setUp(self):
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        self.client.is_login = True
+        self.server = FakeFolders()
+        self.client.session.post = self.server.post
+        self.nav = lanzou_web.NavigationContext(self.client)
+
+    def test_cd_uses_cache(self):
+        self.nav.cd("docs")
+        self.nav.cd("..")
+        self.nav.cd("docs")
+        self.assertEqual(self.server.requests, 1)
+
+    def test_folder_created_after_caching_is_found(self):
+        self.client.get_folders("-1", use_cache=True)
+        self.server.folders["-1"].append(("11", "new"))
+        self.assertEqual(self.nav.cd("new"), "/根目录/new")
+        self.assertEqual(self.client.resolve_path("/new"), ("11", "/根目录/new"))
+        self.assertEqual(self.server.requests, 2)
+
+    def test_make_dirs_does_not_duplicate_folder_created_after_caching(self):
+        self.client.get_folders("-1", use_cache=True)
+        self.server.folders["-1"].append(("11", "new"))
+        self.assertEqual(self.client.make_dirs("-1", "new/sub"), "104")
+        self.assertEqual([name for _, name in self.server.folders["-1"]], ["docs", "new"])
+        self.assertEqual(self.server.folders["11"], [("104", "sub")])
+
+    def test_missing_folder(self):
+        with self.assertRaises(lanzou_web.PathError):
+            self.nav.cd("nope")
+        self.assertIsNone(self.nav.resolve_path("docs/nope"))
+
+
+if __name__ == "__main__":
+    unittest.main()
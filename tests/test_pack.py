@@ -0,0 +1,55 @@
+import io
+import os
+import tarfile
+import tempfile
+import time
+import unittest
+import zipfile
+
+import lanzou_web
+
+
+class PackTest(unittest.TestCase):
+    def test_zip_packs_split_before_zip64_member_count(self):
+        members = [("/dev/null", f"f{i}", 0) for i in range(lanzou_web.ZIP_MAX_MEMBERS + 10)]
+        packs = lanzou_web.plan_packs(members, 90 * 1024 * 1024, 'zip')
+        self.assertEqual([len(pack) for pack in packs], [lanzou_web.ZIP_MAX_MEMBERS, 10])
+        # tar 没有成员数限制
+        self.assertEqual(len(lanzou_web.plan_packs(members, 90 * 1024 * 1024, 'tar')), 1)
+
+    def test_layout_matches_stream(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            members = []
+            for i, size in enumerate([0, 1, 1000, 70000]):
+                path = os.path.join(tmp, f"f{i}.txt")
+                with open(path, 'wb') as f:
+                    f.write(b'x' * size)
+                members.append((path, os.path.join('dir', f"文件{i}.txt"), size))
+            for fmt in lanzou_web.PACK_FORMATS:
+                size, _ = lanzou_web.pack_layout(members, fmt)
+                self.assertEqual(size, sum(len(chunk) for chunk in lanzou_web.stream_pack(members, fmt)), fmt)
+
+    def test_members_keep_file_mtime(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            members = []
+            for i, mtime in enumerate([1700000000, 100000000]):
+                path = os.path.join(tmp, f"f{i}.txt")
+                with open(path, 'wb') as f:
+                    f.write(b'x' * 10)
+                os.utime(path, (mtime, mtime))
+                members.append((path, f"f{i}.txt", 10))
+            for fmt in lanzou_web.PACK_FORMATS:
+                data = b"".join(lanzou_web.stream_pack(members, fmt))
+                self.assertEqual(len(data), lanzou_web.pack_layout(members, fmt)[0], fmt)
+                if fmt == 'zip':
+                    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                        self.assertEqual(archive.getinfo("f0.txt").date_time, time.localtime(1700000000)[:6])
+                        # zip 不能记录 1980 年以前的时间
+                        self.assertEqual(archive.getinfo("f1.txt").date_time, (1980, 1, 1, 0, 0, 0))
+                else:
+                    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+                        self.assertEqual([member.mtime for member in archive.getmembers()], [1700000000, 100000000])
+
+
+if __name__ == "__main__":
+    unittest.main()
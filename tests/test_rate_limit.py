@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+
+import lanzou_web
+
+
+class FakeClock:
+    """替代 time.monotonic/time.sleep，sleep 只推进时钟并记录等待时长"""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(lanzou_web.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_transfers_share_the_rate(self):
+        bucket = lanzou_web.TokenBucket(4096, burst=1024)
+        transfers = [bucket.throttle(iter([b"x" * 8192])) for _ in range(3)]
+        sent = 0
+        # 三个传输轮流发送，模拟并发
+        while transfers:
+            for transfer in list(transfers):
+                try:
+                    sent += len(next(transfer))
+                except StopIteration:
+                    transfers.remove(transfer)
+        self.assertEqual(sent, 3 * 8192)
+        self.assertAlmostEqual(self.clock.now, (sent - 1024) / 4096)
+
+    def test_waiters_are_served_in_arrival_order(self):
+        bucket = lanzou_web.TokenBucket(1000, burst=1000)
+        # sleep 不推进时钟，相当于三个调用同时到达后各自等待
+        waits = []
+        with mock.patch.object(lanzou_web.time, "sleep", waits.append):
+            bucket.consume(1000)
+            bucket.consume(500)
+            bucket.consume(500)
+            bucket.consume(250)
+        self.assertEqual(waits, [0.5, 1.0, 1.25])
+
+    def test_zero_rate_is_unlimited(self):
+        bucket = lanzou_web.TokenBucket(0)
+        bucket.consume(1 << 20)
+        self.assertEqual(b"".join(bucket.throttle(iter([b"a" * 100, b"b"]))), b"a" * 100 + b"b")
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_make_rate_limiter(self):
+        for limit in (None, "", 0, "0", "0K"):
+            with self.subTest(limit=limit):
+                self.assertIsNone(lanzou_web.make_rate_limiter(limit))
+        self.assertEqual(lanzou_web.make_rate_limiter("20M").rate, 20 * 1024 * 1024)
+        self.assertEqual(lanzou_web.make_rate_limiter(2048).rate, 2048)
+        with self.assertRaises(ValueError):
+            lanzou_web.make_rate_limiter("fast")
+
+    def test_config_zero_limit_means_unlimited(self):
+        client = lanzou_web.LanZouWeb(config={"uid": "1", "upload_limit": "0"})
+        self.assertIsNone(client.rate_limiter)
+        with self.assertRaises(lanzou_web.ConfigError):
+            lanzou_web.LanZouWeb(config={"uid": "1", "upload_limit": "fast"})
+
+
+if __name__ == "__main__":
+    unittest.main()
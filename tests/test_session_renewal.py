@@ -0,0 +1,136 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+import lanzou_web
+
+
+def make_response(body, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    return response
+
+
+class FakeServer:
+    """模拟蓝奏云接口: expired 为 True 时接口返回 zt 9，mydisk 页面要求登录"""
+    def __init__(self, client):
+        self.client = client
+        self.expired = False
+        self.logins = 0
+        self.expired_reply = {"zt": 9, "info": "登录超时，请重新登录"}
+
+    def post(self, url, data=None, files=None, **kwargs):
+        if url == self.client.login_url:
+            self.logins += 1
+            self.expired = False
+            return make_response({"zt": 1, "info": "成功登录"})
+        if self.expired:
+            return make_response(self.expired_reply)
+        return make_response({"zt": 1, "info": 1, "text": [
+            {"id": "1", "name": "a.txt", "name_all": "a.txt", "size": "1.0 K", "time": "昨天"}]})
+
+    def get(self, url, **kwargs):
+        if self.expired:
+            return make_response("请登录".encode())
+        return make_response('<a href="x" class="text">mockuser</a>'.encode())
+
+
+class SessionRenewalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        self.client.cookie_file = os.path.join(self.tmp.name, "cookie.json")
+        self.server = FakeServer(self.client)
+        self.client.session.post = self.server.post
+        self.client.session.get = self.server.get
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cli_login_from_saved_cookie_renews_after_expiry(self):
+        with open(self.client.cookie_file, "w") as f:
+            json.dump({"phpdisk_info": "saved"}, f)
+        with mock.patch.object(lanzou_web.time, "sleep"), mock.patch.object(lanzou_web.os, "system"), \
+                mock.patch("builtins.print"):
+            self.assertTrue(lanzou_web.cli_login(self.client, "u", "p"))
+        self.assertEqual(self.server.logins, 0)
+
+        self.server.expired = True
+        files = self.client.get_files("-1")
+        self.assertEqual([file.name for file in files], ["a.txt"])
+        self.assertEqual(self.server.logins, 1)
+
+    def test_html_login_page_triggers_renewal(self):
+        self.client.set_credentials("u", "p")
+        self.client.is_login = True
+        self.server.expired = True
+        self.server.expired_reply = "<html>请登录</html>".encode()
+        files = self.client.get_files("-1")
+        self.assertEqual([file.name for file in files], ["a.txt"])
+        self.assertEqual(self.server.logins, 1)
+
+    def test_non_json_reply_raises_request_error(self):
+        self.client.is_login = True
+        self.server.expired = True
+        self.server.expired_reply = b"<html>502</html>"
+        with self.assertRaises(lanzou_web.RequestError):
+            self.client.get_files("-1")
+
+    def test_renew_without_credentials_raises_login_error(self):
+        self.client.is_login = True
+        self.server.expired = True
+        with self.assertRaises(lanzou_web.LoginError):
+            self.client.get_files("-1")
+
+    def test_concurrent_renewals_log_in_once(self):
+        self.client.set_credentials("u", "p")
+        self.client.is_login = True
+        generation = self.client.session_generation
+        slow_post = self.server.post
+
+        def post(url, **kwargs):
+            if url == self.client.login_url:
+                time.sleep(0.05)  # 登录较慢时，其他线程都会在等待中发现已经重新登录
+            return slow_post(url, **kwargs)
+
+        self.client.session.post = post
+        barrier = threading.Barrier(8)
+        errors = []
+
+        def renew():
+            barrier.wait()
+            try:
+                self.client.renew_session(generation)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=renew) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.server.logins, 1)
+        self.assertEqual(self.client.session_generation, generation + 1)
+
+
+class LoginRequiredTest(unittest.TestCase):
+    def test_uploads_raise_login_error_when_not_logged_in(self):
+        client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        with self.assertRaises(lanzou_web.LoginError):
+            client.transfer_stream("a.txt", iter([b"a"]), 1)
+        with self.assertRaises(lanzou_web.LoginError):
+            client.upload_with_retry(__file__)
+        with self.assertRaises(lanzou_web.LoginError):
+            client.upload_batch([(__file__, "-1")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+
+import requests
+
+import lanzou_web
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class FakeShareServer:
+    """模拟 task 22 分享接口和 task 6 删除接口，记录分享请求的文件ID"""
+    def __init__(self):
+        self.share_requests = []
+
+    def post(self, url, data=None, **kwargs):
+        if data["task"] == "6":
+            return make_response({"zt": 1, "info": "已删除"})
+        self.share_requests.append(data["file_id"])
+        return make_response({"zt": 1, "info": {
+            "is_newd": "https://example.lanzoux.com/", "f_id": "s" + data["file_id"], "onof": "1", "pwd": "ab12"}})
+
+
+class ShareCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_file = os.path.join(self.tmp.name, "share_cache.json")
+        self.server = FakeShareServer()
+        self.client = self.make_client()
+
+    def make_client(self):
+        client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        client.is_login = True
+        client.share_cache_file = self.cache_file
+        client.session.post = self.server.post
+        return client
+
+    def test_miss_then_hit(self):
+        info = self.client.get_share_info("1")
+        self.assertEqual(info, {"file_id": "1", "url": "https://example.lanzoux.com/s1", "pwd": "ab12"})
+        self.assertEqual(self.client.get_share_info("1"), info)
+        self.assertEqual(self.server.share_requests, ["1"])
+
+        self.client.get_share_info("1", use_cache=False)
+        self.assertEqual(self.server.share_requests, ["1", "1"])
+
+    def test_saved_cache_is_used_by_a_new_client(self):
+        self.client.get_share_infos(["1", "2"])
+        client = self.make_client()
+        self.assertEqual(client.get_share_info("2")["url"], "https://example.lanzoux.com/s2")
+        self.assertEqual(self.server.share_requests, ["1", "2"])
+
+    def test_delete_file_invalidates_entry(self):
+        self.client.get_share_infos(["1", "2"])
+        self.client.delete_file("1")
+        with open(self.cache_file) as f:
+            self.assertEqual(sorted(json.load(f)), ["2"])
+
+        client = self.make_client()
+        client.get_share_info("1")
+        client.get_share_info("2")
+        self.assertEqual(self.server.share_requests, ["1", "2", "1"])
+
+    def test_delete_uncached_file_does_not_write_cache(self):
+        self.client.delete_file("1")
+        self.assertFalse(os.path.exists(self.cache_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+from unittest import mock
+
+import lanzou_web
+
+
+class TransportChoiceTest(unittest.TestCase):
+    def setUp(self):
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1", "upload_transport": "sendfile"})
+        self.client.transfer_stream = mock.Mock(return_value="stream")
+        self.client.transfer_sendfile = mock.Mock(return_value="sendfile")
+
+    def test_sendfile_used_for_http(self):
+        self.client.base_url = "http://127.0.0.1:8080"
+        self.assertEqual(self.client.transfer_file(__file__), "sendfile")
+
+    def test_https_falls_back_to_requests(self):
+        self.assertTrue(self.client.base_url.startswith("https://"))
+        self.assertEqual(self.client.transfer_file(__file__), "stream")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import lanzou_web
+
+
+class UploadBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i, size in enumerate([300, 100, 200, 50, 400, 10]):
+            path = os.path.join(self.tmp.name, f"f{i}.txt")
+            with open(path, "wb") as f:
+                f.write(b"x" * size)
+            self.paths.append(path)
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        self.client.is_login = True
+        self.client.share_cache_file = os.path.join(self.tmp.name, "share_cache.json")
+        self.client.fetch_share_link = lambda file_id: f"https://example.com/{file_id}"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_batch(self, **kwargs):
+        """在后台线程中运行 upload_batch，返回 (结果或异常, 是否在超时前结束)"""
+        outcome = {}
+
+        def run():
+            try:
+                outcome['value'] = self.client.upload_batch([(path, "-1") for path in self.paths], **kwargs)
+            except BaseException as e:
+                outcome['value'] = e
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        return outcome.get('value'), not thread.is_alive()
+
+    def test_interrupt_does_not_hang(self):
+        def transfer_file(path, folder_id):
+            raise KeyboardInterrupt
+
+        self.client.transfer_file = transfer_file
+        value, finished = self.run_batch()
+        self.assertTrue(finished)
+        self.assertIsInstance(value, KeyboardInterrupt)
+
+    def test_unexpected_error_only_fails_that_file(self):
+        def transfer_file(path, folder_id):
+            if path == self.paths[1]:
+                raise RuntimeError("boom")
+            return os.path.basename(path)
+
+        self.client.transfer_file = transfer_file
+        for workers in (1, 3):
+            results, finished = self.run_batch(workers=workers)
+            self.assertTrue(finished)
+            self.assertIn("boom", results[1]['error'])
+            self.assertEqual([result['url'] for i, result in enumerate(results) if i != 1],
+                             [f"https://example.com/f{i}.txt" for i in (0, 2, 3, 4, 5)])
+
+    def test_stages_overlap_and_results_keep_order(self):
+        events = []
+        lock = threading.Lock()
+
+        def log(event):
+            with lock:
+                events.append(event)
+
+        def transfer_file(path, folder_id):
+            name = os.path.basename(path)
+            log(('transfer_start', name))
+            time.sleep(0.05)
+            log(('transfer_end', name))
+            return name
+
+        def fetch_share_link(file_id):
+            log(('share_start', file_id))
+            time.sleep(0.05)
+            return f"https://example.com/{file_id}"
+
+        self.client.transfer_file = transfer_file
+        self.client.fetch_share_link = fetch_share_link
+        results, finished = self.run_batch(small_first=True)
+        self.assertTrue(finished)
+        # 结果与传入顺序一致，传输按文件大小从小到大
+        self.assertEqual([result['url'] for result in results],
+                         [f"https://example.com/f{i}.txt" for i in range(6)])
+        transfers = [name for event, name in events if event == 'transfer_start']
+        self.assertEqual(transfers, ["f5.txt", "f3.txt", "f1.txt", "f2.txt", "f0.txt", "f4.txt"])
+        # 第一个文件获取分享链接时，第二个文件已经开始传输
+        self.assertLess(events.index(('share_start', "f5.txt")), events.index(('transfer_end', "f3.txt")))
+
+
+if __name__ == "__main__":
+    unittest.main()
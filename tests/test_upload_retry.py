@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+import lanzou_web
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class FakeUploadServer:
+    """模拟 html5up.php 上传接口和 task 22 分享接口，记录各自被调用的次数"""
+    def __init__(self, client):
+        self.client = client
+        self.transfers = 0
+        self.share_requests = 0
+        self.transfer_replies = []  # 依次使用的上传响应，用完后返回成功；元素为异常时抛出
+        self.share_failures = 0  # 前几次分享请求返回失败
+
+    def post(self, url, data=None, **kwargs):
+        if url.endswith("/html5up.php"):
+            self.transfers += 1
+            for _ in data:
+                pass
+            reply = self.transfer_replies.pop(0) if self.transfer_replies else {"zt": 1, "text": [{"id": "42"}]}
+            if isinstance(reply, Exception):
+                raise reply
+            return make_response(reply)
+        self.share_requests += 1
+        if self.share_requests <= self.share_failures:
+            return make_response({"zt": 0, "info": "请稍后再试"})
+        return make_response({"zt": 1, "info": {"is_newd": "https://example.lanzoux.com", "f_id": "abc", "onof": "0"}})
+
+
+class UploadRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "a.txt")
+        with open(self.path, "wb") as f:
+            f.write(b"hello")
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        self.client.is_login = True
+        self.client.share_cache_file = os.path.join(self.tmp.name, "share_cache.json")
+        self.server = FakeUploadServer(self.client)
+        self.client.session.post = self.server.post
+        self.retries = []
+        self.client.on_event = lambda event, info: self.retries.append(info["description"]) if event == "retry" else None
+        patcher = mock.patch.object(lanzou_web.time, "sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_metadata_failure_retries_only_metadata(self):
+        self.server.share_failures = 2
+        url = self.client.upload_with_retry(self.path)
+        self.assertEqual(url, "https://example.lanzoux.com/abc")
+        self.assertEqual(self.server.transfers, 1)
+        self.assertEqual(self.server.share_requests, 3)
+        self.assertEqual(self.retries, ["获取分享链接", "获取分享链接"])
+
+    def test_metadata_failure_keeps_file_id(self):
+        self.server.share_failures = lanzou_web.UPLOAD_RETRIES
+        with self.assertRaises(lanzou_web.MetadataError) as cm:
+            self.client.upload_with_retry(self.path)
+        self.assertEqual(cm.exception.file_id, "42")
+        self.assertEqual(self.server.transfers, 1)
+
+    def test_connection_error_is_transport_error_and_retried(self):
+        self.server.transfer_replies = [requests.ConnectionError("connection reset")]
+        self.assertEqual(self.client.upload_with_retry(self.path), "https://example.lanzoux.com/abc")
+        self.assertEqual(self.server.transfers, 2)
+        self.assertEqual(self.retries, ["上传"])
+
+        self.server.transfer_replies = [requests.ConnectionError("connection reset")]
+        with self.assertRaises(lanzou_web.TransportError):
+            self.client.upload_file(self.path)
+
+    def test_server_refusal_is_not_retried(self):
+        self.server.transfer_replies = [{"zt": 0, "info": "不允许上传的文件类型"}]
+        with self.assertRaises(lanzou_web.ServerRejectedError) as cm:
+            self.client.upload_with_retry(self.path)
+        self.assertIn("不允许上传的文件类型", str(cm.exception))
+        self.assertEqual(self.server.transfers, 1)
+        self.assertEqual(self.server.share_requests, 0)
+        self.assertEqual(self.retries, [])
+
+    def test_missing_local_file_is_local_file_error(self):
+        with self.assertRaises(lanzou_web.LocalFileError):
+            self.client.upload_with_retry(os.path.join(self.tmp.name, "missing.txt"))
+        self.assertEqual(self.server.transfers, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import os
+import tracemalloc
+import unittest
+
+import lanzou_web
+
+
+class ReadOnlyStream:
+    """只有 read() 的数据流，如某些管道包装对象"""
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._stream.read(min(size, 1000))
+
+
+class UploadStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.client = lanzou_web.LanZouWeb(config={"uid": "1"})
+        self.client.is_login = True
+        self.client.save_share_cache = lambda: None
+        self.client.fetch_share_link = lambda file_id: f"https://example.com/{file_id}"
+        self.uploaded = []
+
+        def transfer_stream(name, chunks, size, folder_id=None):
+            if self.keep_data:
+                data = b"".join(chunks)
+                self.assertEqual(len(data), size)
+                self.uploaded.append(data)
+            else:
+                self.assertEqual(sum(len(chunk) for chunk in chunks), size)
+                self.uploaded.append(size)
+            return str(len(self.uploaded))
+
+        self.keep_data = True
+
+        self.client.transfer_stream = transfer_stream
+
+    def test_parts(self):
+        for stream_class in (io.BytesIO, ReadOnlyStream):
+            self.uploaded.clear()
+            data = os.urandom(25000)
+            results = self.client.upload_stream(stream_class(data), "dump.tar", part_size=10000)
+            self.assertEqual([(r['name'], r['size']) for r in results],
+                             [("dump.part001.tar", 10000), ("dump.part002.tar", 10000), ("dump.part003.tar", 5000)])
+            self.assertEqual(b"".join(self.uploaded), data)
+
+    def test_single_buffer_across_parts(self):
+        part_size = 4 * 1024 * 1024
+        self.keep_data = False
+        stream = io.BytesIO(b"x" * (3 * part_size + 1))
+        tracemalloc.start()
+        try:
+            self.client.upload_stream(stream, "big.bin", part_size=part_size)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1.5 * part_size)
+
+    def test_failed_part_keeps_completed_parts(self):
+        saved = []
+        self.client.save_share_cache = lambda: saved.append(True)
+        upload = self.client.transfer_stream
+
+        def transfer_stream(name, chunks, size, folder_id=None):
+            if name == "dump.part002.tar":
+                raise lanzou_web.ServerRejectedError("rejected")
+            return upload(name, chunks, size, folder_id)
+
+        self.client.transfer_stream = transfer_stream
+        with self.assertRaises(lanzou_web.ServerRejectedError) as caught:
+            self.client.upload_stream(io.BytesIO(b"x" * 25000), "dump.tar", part_size=10000)
+        self.assertEqual([(part['name'], part['url']) for part in caught.exception.parts],
+                         [("dump.part001.tar", "https://example.com/1")])
+        self.assertEqual(saved, [True])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import tempfile
+import unittest
+
+import lanzou_web
+
+
+class RequeueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.watcher = lanzou_web.DirectoryWatcher(self.tmp.name, settle=0.1, poll_interval=0.05)
+
+    def tearDown(self):
+        self.watcher.close()
+        self.tmp.cleanup()
+
+    def test_failed_paths_come_back_after_delay(self):
+        with open(os.path.join(self.tmp.name, "drop.txt"), "w") as f:
+            f.write("once")
+        self.assertEqual(self.watcher.wait_batch(timeout=5), ["drop.txt"])
+
+        # 上传失败后重新排队，文件不再变化也会再次返回
+        self.watcher.requeue(["drop.txt"], 0.2)
+        self.assertEqual(self.watcher.wait_batch(timeout=0.05), [])
+        self.assertEqual(self.watcher.wait_batch(timeout=5), ["drop.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()